@@ -1,15 +1,22 @@
 #!/usr/bin/env python3
 """ASCII NFT Art Generator — Animated GIF with Matrix Rain
 Converts NFT PFP → green ASCII matrix rain animated GIF (<2MB target)
-Usage: python3 ascii-gif-gen.py <image_path> <output.gif> [--cols 80] [--frames 30]
+Usage: python3 ascii-gif-gen.py <image_path> <output.gif> [--cols 80] [--frames 30] [--seed ID] [--palette global|adaptive] [--max-mb 2]
 """
-import sys, os, random, colorsys, argparse
+import sys, os, random, colorsys, argparse, hashlib
 from PIL import Image, ImageDraw, ImageFont, ImageFilter, ImageEnhance
 import numpy as np
 
 RAMP = "$@B%8&WM#*oahkbdpqwmZO0QLCJUYXzcvunxrjft/\\|()1{}[]?-_+~<>i!lI;:,\"^`'. "
 CHARS = list("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789!@#$%^&*(){}[]<>?/\\|~+-=_:;,.")
 
+def piece_seed(piece_id):
+    """Stable 64-bit seed from a piece ID or source asset ID (any str), or an int used as-is."""
+    if isinstance(piece_id, int):
+        return piece_id
+    return int.from_bytes(hashlib.sha256(str(piece_id).encode()).digest()[:8], 'big')
+
+
 def build_grid(img, cols=80):
     """Build ASCII grid with green color mapping from image."""
     img = ImageEnhance.Contrast(img).enhance(1.4)
@@ -68,23 +75,68 @@ def build_grid(img, cols=80):
     return grid, rows, cols
 
 
+RAIN_HEAD = (220, 255, 220)
+RAIN_MAX_LEN = 8  # streak 'len' is 3 + randint(0, 5)
+
+
+def rain_colors():
+    """Every color MatrixRain.get_overlay can emit."""
+    return [RAIN_HEAD] + [(0, max(0, 180 - j * 35), 0) for j in range(1, RAIN_MAX_LEN)]
+
+
+def palette_sample(grid, rows, cols, font, char_w, char_h):
+    """Every non-background pixel of the grid drawn once, as a 1-pixel-high RGB strip.
+
+    The glyphs are drawn anti-aliased, so the strip holds the grid colors
+    and their edge blends over black in the proportions frames show them.
+    """
+    img = Image.new('RGB', (char_w * cols, char_h * rows), (0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    for y in range(rows):
+        for x in range(cols):
+            cell = grid[y][x]
+            if cell is not None:
+                draw.text((x * char_w, y * char_h), RAMP[cell[0]], fill=tuple(cell[1:]), font=font)
+    px = np.asarray(img).reshape(-1, 3)
+    px = px[px.any(axis=1)]
+    return Image.fromarray(px[None, :, :] if len(px) else np.zeros((1, 1, 3), dtype=np.uint8), 'RGB')
+
+
+def build_palette(sample, colors=48):
+    """One palette for the whole piece, so frames need no per-frame median cut.
+
+    Index 0 is the black background, then the rain colors; sample (from
+    palette_sample()) is median-cut once into the remaining slots.
+    Returns a 'P' image to map RGB frames with quantize(palette=...).
+    """
+    fixed = list(dict.fromkeys([(0, 0, 0)] + rain_colors()))
+    flat = [v for c in fixed for v in c]
+    q = sample.quantize(colors=colors - len(fixed), method=Image.Quantize.MEDIANCUT, dither=Image.Dither.NONE)
+    flat += q.getpalette()[:3 * (int(np.asarray(q).max()) + 1)]
+    pal = Image.new('P', (1, 1))
+    pal.putpalette(flat)
+    return pal
+
+
 class MatrixRain:
-    """Matrix rain streak manager."""
-    def __init__(self, cols, rows, max_streaks=20, spawn_rate=0.06):
+    """Matrix rain streak manager. rng is a random.Random (fresh entropy if omitted)."""
+    def __init__(self, cols, rows, max_streaks=20, spawn_rate=0.06, rng=None):
         self.cols = cols
         self.rows = rows
         self.max_streaks = max_streaks
         self.spawn_rate = spawn_rate
+        self.rng = rng if rng is not None else random.Random()
         self.streaks = []
 
     def tick(self):
+        rng = self.rng
         # Spawn new streaks
-        if len(self.streaks) < self.max_streaks and random.random() < self.spawn_rate:
+        if len(self.streaks) < self.max_streaks and rng.random() < self.spawn_rate:
             self.streaks.append({
-                'x': random.randint(0, self.cols - 1),
-                'y': -random.random() * self.rows * 0.3,
-                'speed': 0.5 + random.random() * 0.6,
-                'len': 3 + random.randint(0, 5)
+                'x': rng.randint(0, self.cols - 1),
+                'y': -rng.random() * self.rows * 0.3,
+                'speed': 0.5 + rng.random() * 0.6,
+                'len': 3 + rng.randint(0, 5)
             })
 
         # Move streaks
@@ -102,18 +154,25 @@ class MatrixRain:
                 sy = int(s['y']) - j
                 if sy < 0 or sy >= self.rows:
                     continue
-                ch = random.choice(CHARS)
+                ch = self.rng.choice(CHARS)
                 if j == 0:
                     # Head: bright white-green
-                    overlay[(s['x'], sy)] = (ch, 220, 255, 220)
+                    overlay[(s['x'], sy)] = (ch, *RAIN_HEAD)
                 else:
                     bright = max(0, 180 - j * 35)
                     overlay[(s['x'], sy)] = (ch, 0, bright, 0)
         return overlay
 
 
-def render_frame(grid, rows, cols, rain, rng, font, char_w, char_h, target_size=1080, flicker_rate=0.12):
-    """Render one frame of the animation at target resolution."""
+def render_frame(grid, rows, cols, rain, rng, font, char_w, char_h, target_size=1080, flicker_rate=0.12,
+                 palette=None, cells=None):
+    """Render one frame of the animation at target resolution.
+
+    palette: build_palette() result. The anti-aliased RGB frame is then
+    mapped onto it (nearest color, before upscaling) instead of getting a
+    per-frame median-cut quantize.
+    cells: optional dict filled with (x, y) -> (char, color) for every cell drawn.
+    """
     # Render at native char size first
     native_w = char_w * cols
     native_h = char_h * rows
@@ -130,6 +189,8 @@ def render_frame(grid, rows, cols, rain, rng, font, char_w, char_h, target_size=
             if (x, y) in overlay:
                 ch, r, g, b = overlay[(x, y)]
                 draw.text((x * char_w, y * char_h), ch, fill=(r, g, b), font=font)
+                if cells is not None:
+                    cells[(x, y)] = (ch, r, g, b)
                 continue
 
             cell = grid[y][x]
@@ -143,6 +204,8 @@ def render_frame(grid, rows, cols, rain, rng, font, char_w, char_h, target_size=
             else:
                 ch = RAMP[density_idx]
             draw.text((x * char_w, y * char_h), ch, fill=(r, g, b), font=font)
+            if cells is not None:
+                cells[(x, y)] = (ch, r, g, b)
 
     # Scale up to target square resolution using nearest neighbor (keeps chars crisp)
     # Pad to square first
@@ -152,17 +215,155 @@ def render_frame(grid, rows, cols, rain, rng, font, char_w, char_h, target_size=
         square = Image.new('RGB', (max_dim, max_dim), (0, 0, 0))
         square.paste(img, ((max_dim - w) // 2, (max_dim - h) // 2))
         img = square
-    
+
+    if palette is not None:
+        img = img.quantize(palette=palette, dither=Image.Dither.NONE)
     if img.size[0] != target_size:
         img = img.resize((target_size, target_size), Image.NEAREST)
     
+    if palette is not None:
+        return img
     # Convert to palette mode for GIF
     img = img.quantize(colors=64, method=Image.Quantize.MEDIANCUT, dither=Image.Dither.NONE)
     return img
 
 
-def generate_gif(image_path, output_path, cols=80, num_frames=30, fps=10):
-    """Main pipeline: image → animated ASCII GIF."""
+def dirty_box(prev_cells, cells, char_w, char_h, native_size, target_size):
+    """Output-pixel box (x0, y0, x1, y1) covering every cell that differs between two frames, or None.
+
+    Padded by one cell on each side, since glyphs may spill over their cell.
+    """
+    changed = [k for k in prev_cells.keys() | cells.keys() if prev_cells.get(k) != cells.get(k)]
+    if not changed:
+        return None
+    w, h = native_size
+    max_dim = max(w, h)
+    ox, oy = (max_dim - w) // 2, (max_dim - h) // 2
+    scale = target_size / max_dim
+    xs = [x for x, _ in changed]
+    ys = [y for _, y in changed]
+    x0 = (ox + (min(xs) - 1) * char_w) * scale
+    y0 = (oy + (min(ys) - 1) * char_h) * scale
+    x1 = (ox + (max(xs) + 2) * char_w) * scale
+    y1 = (oy + (max(ys) + 2) * char_h) * scale
+    return (max(0, int(x0)), max(0, int(y0)), min(target_size, int(np.ceil(x1)) + 1), min(target_size, int(np.ceil(y1)) + 1))
+
+
+def save_delta_gif(output_path, frames, boxes, duration):
+    """Write frames (full 'P' images sharing one palette) as a looping GIF of dirty rectangles.
+
+    Frame i is only boxes[i] (None: nothing changed), with pixels equal to
+    frame i-1 set to a transparent index, so unchanged areas cost almost
+    nothing to LZW-encode and no optimizer pass is needed.
+    """
+    from PIL import GifImagePlugin
+    flat = frames[0].getpalette()
+    transparent = len(flat) // 3
+    flat = flat + [0, 0, 0]
+    if transparent > 255:
+        raise ValueError("palette needs a free slot for transparency (use <= 255 colors)")
+    first = frames[0].copy()
+    first.putpalette(flat)
+    header, _ = GifImagePlugin.getheader(first, info={"loop": 0, "duration": duration})
+    with open(output_path, 'wb') as fp:
+        for chunk in header:
+            fp.write(chunk)
+        for chunk in GifImagePlugin.getdata(first, duration=duration, disposal=1):
+            fp.write(chunk)
+        prev = np.asarray(frames[0])
+        for frame, box in zip(frames[1:], boxes[1:]):
+            cur = np.asarray(frame)
+            x0, y0, x1, y1 = box or (0, 0, 1, 1)
+            patch = cur[y0:y1, x0:x1]
+            delta = np.where(patch == prev[y0:y1, x0:x1], transparent, patch).astype(np.uint8)
+            im = Image.fromarray(delta, 'P')
+            im.putpalette(flat)
+            for chunk in GifImagePlugin.getdata(im, offset=(x0, y0), duration=duration, disposal=1,
+                                                transparency=transparent):
+                fp.write(chunk)
+            prev = cur
+        fp.write(b";")
+
+
+MIN_COLORS = 16
+MIN_FRAMES = 8
+
+
+def reduce_palette(frames, colors):
+    """frames (sharing one palette) mapped onto the colors-entry palette of the same grid.
+
+    colors is a build_palette() result; each old index goes to the nearest
+    new color (the fixed black and rain entries map to themselves).
+    """
+    flat = colors.getpalette()
+    old = np.array(frames[0].getpalette(), dtype=np.int32).reshape(-1, 3)
+    new = np.array(flat, dtype=np.int32).reshape(-1, 3)
+    lut = ((old[:, None, :] - new[None, :, :]) ** 2).sum(axis=2).argmin(axis=1).astype(np.uint8)
+    out = []
+    for frame in frames:
+        im = Image.fromarray(lut[np.asarray(frame)], 'P')
+        im.putpalette(flat)
+        out.append(im)
+    return out
+
+
+def gif_size(frames, boxes, duration):
+    """Bytes save_delta_gif() writes for frames (a trial encode to a temp file)."""
+    import tempfile
+    fd, path = tempfile.mkstemp(suffix='.gif')
+    os.close(fd)
+    try:
+        save_delta_gif(path, frames, [None] + boxes[1:], duration)
+        return os.path.getsize(path)
+    finally:
+        os.remove(path)
+
+
+def fit_colors(pixels, frames, boxes, duration, max_bytes, colors=48, trial_frames=10):
+    """Largest palette (then frame count) whose delta GIF should fit max_bytes: (palette, num_frames).
+
+    pixels: the palette_sample() the palettes are built from.
+    Bisects the color count between MIN_COLORS and colors with trial
+    encodes of trial_frames consecutive mid-clip frames, scaled to the full
+    length. Only if MIN_COLORS is still over budget is the frame count cut,
+    proportionally and never below MIN_FRAMES.
+    """
+    window = min(trial_frames, len(frames))
+    first = (len(frames) - window) // 2
+    sample, sample_boxes = frames[first:first + window], boxes[first:first + window]
+    scale = len(frames) / window
+
+    def estimate(n):
+        return gif_size(reduce_palette(sample, build_palette(pixels, n)), sample_boxes, duration) * scale
+
+    lo, hi = MIN_COLORS, colors
+    at_lo = estimate(lo)
+    if at_lo > max_bytes:
+        return build_palette(pixels, lo), max(min(MIN_FRAMES, len(frames)), int(len(frames) * max_bytes / at_lo))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if estimate(mid) <= max_bytes:
+            lo = mid
+        else:
+            hi = mid - 1
+    return build_palette(pixels, lo), len(frames)
+
+
+def generate_gif(image_path, output_path, cols=80, num_frames=30, fps=10, seed=None, palette="global", colors=48,
+                 max_bytes=None):
+    """Main pipeline: image → animated ASCII GIF.
+
+    seed: piece ID / source asset ID (or int) that all rain and flicker
+    randomness derives from; defaults to the output file name without
+    extension, so re-rendering a piece reproduces it exactly.
+    palette: "global" builds one palette of colors entries for the piece
+    from its anti-aliased glyphs, maps every frame onto it and writes
+    frames as dirty rectangles (save_delta_gif); "adaptive" is the old RGB render + 64-color median
+    cut per frame, left for Pillow and gifsicle to optimize.
+    max_bytes: size budget (default the 2MB target, only warned about).
+    With a global palette, fit_colors() picks the palette size (then the
+    frame count) from trial encodes before the one final encode.
+    """
     print(f"Loading {image_path}...")
     src = Image.open(image_path).convert('RGB')
 
@@ -183,38 +384,65 @@ def generate_gif(image_path, output_path, cols=80, num_frames=30, fps=10):
     char_w = max(1, int(font.getlength("M")))
     char_h = font_size + 2
 
-    rain = MatrixRain(grid_cols, rows, max_streaks=20, spawn_rate=0.06)
-    rng = random.Random(42)
-
-    print(f"Rendering {num_frames} frames...")
-    frames = []
+    if seed is None:
+        seed = os.path.splitext(os.path.basename(output_path))[0]
+    rain_seed, flicker_seed = np.random.SeedSequence(piece_seed(seed)).generate_state(2)
+    rain = MatrixRain(grid_cols, rows, max_streaks=20, spawn_rate=0.06, rng=random.Random(int(rain_seed)))
+    rng = random.Random(int(flicker_seed))
+
+    if palette == "global":
+        sample = palette_sample(grid, rows, grid_cols, font, char_w, char_h)
+        pal = build_palette(sample, colors)
+    else:
+        pal = None
+
+    print(f"Rendering {num_frames} frames ({palette} palette)...")
+    frames, boxes = [], []
+    prev_cells = None
     for i in range(num_frames):
-        f = render_frame(grid, rows, grid_cols, rain, rng, font, char_w, char_h)
+        cells = {} if pal is not None else None
+        f = render_frame(grid, rows, grid_cols, rain, rng, font, char_w, char_h, palette=pal, cells=cells)
         frames.append(f)
+        if pal is not None:
+            boxes.append(None if prev_cells is None else
+                         dirty_box(prev_cells, cells, char_w, char_h, (char_w * grid_cols, char_h * rows), f.size[0]))
+            prev_cells = cells
         if (i + 1) % 10 == 0:
             print(f"  Frame {i + 1}/{num_frames}")
 
     duration = int(1000 / fps)  # ms per frame
+    budget = max_bytes or 2 * 1024 * 1024
+    if max_bytes and pal is not None:
+        fitted, fit = fit_colors(sample, frames, boxes, duration, max_bytes, colors)
+        print(f"Budget {max_bytes / 1024 / 1024:.2f}MB: {len(fitted.getpalette()) // 3} colors"
+              + (f", {fit} frames" if fit < num_frames else ""))
+        frames, boxes = reduce_palette(frames[:fit], fitted), boxes[:fit]
     print(f"Saving GIF ({duration}ms/frame, {fps}fps)...")
-    frames[0].save(
-        output_path,
-        save_all=True,
-        append_images=frames[1:],
-        duration=duration,
-        loop=0,
-        optimize=True
-    )
+    if pal is not None:
+        save_delta_gif(output_path, frames, boxes, duration)
+    else:
+        frames[0].save(
+            output_path,
+            save_all=True,
+            append_images=frames[1:],
+            duration=duration,
+            loop=0,
+            optimize=True
+        )
 
     size_mb = os.path.getsize(output_path) / 1024 / 1024
     print(f"Raw: {output_path} ({size_mb:.2f}MB)")
 
-    # Optimize with gifsicle if available
+    # Optimize with gifsicle if available. Delta frames are already compact,
+    # so in global-palette mode it only runs to rescue a piece over budget.
     import shutil, subprocess
-    if shutil.which('gifsicle'):
+    if shutil.which('gifsicle') and (pal is None or size_mb * 1024 * 1024 > budget):
         tmp_opt = output_path + '.opt'
         try:
+            # A global palette is already final; only adaptive frames need gifsicle's color reduction
+            reduce = ['--colors', str(colors)] if pal is None else []
             subprocess.run([
-                'gifsicle', '-O3', '--lossy=100', '--colors', '48',
+                'gifsicle', '-O3', '--lossy=100', *reduce,
                 output_path, '-o', tmp_opt
             ], check=True, capture_output=True)
             os.replace(tmp_opt, output_path)
@@ -226,8 +454,8 @@ def generate_gif(image_path, output_path, cols=80, num_frames=30, fps=10):
                 os.remove(tmp_opt)
     
     print(f"Done: {output_path} ({size_mb:.2f}MB)")
-    if size_mb > 2:
-        print(f"⚠️  Over 2MB target!")
+    if size_mb * 1024 * 1024 > budget:
+        print(f"⚠️  Over {budget / 1024 / 1024:.2f}MB target!")
     return output_path
 
 
@@ -238,6 +466,13 @@ if __name__ == "__main__":
     parser.add_argument("--cols", type=int, default=80, help="ASCII columns (default 80)")
     parser.add_argument("--frames", type=int, default=30, help="Number of frames (default 30)")
     parser.add_argument("--fps", type=int, default=10, help="Frames per second (default 10)")
+    parser.add_argument("--seed", help="Piece or source asset ID seeding all randomness (default: output file name)")
+    parser.add_argument("--palette", choices=("global", "adaptive"), default="global",
+                        help="One palette per piece (default) or a median cut per frame")
+    parser.add_argument("--colors", type=int, default=48, help="Palette size (default 48)")
+    parser.add_argument("--max-mb", type=float, help="Size budget; picks palette size (then frame count) to fit")
     args = parser.parse_args()
 
-    generate_gif(args.image, args.output, cols=args.cols, num_frames=args.frames, fps=args.fps)
+    generate_gif(args.image, args.output, cols=args.cols, num_frames=args.frames, fps=args.fps, seed=args.seed,
+                 palette=args.palette, colors=args.colors,
+                 max_bytes=int(args.max_mb * 1024 * 1024) if args.max_mb else None)
@@ -1,19 +1,95 @@
 #!/usr/bin/env python3
 """ASCII NFT Art Generator — MP4 + PNG
 Converts NFT PFP → animated MP4 + static PNG thumbnail
-Usage: python3 ascii-nft-gen.py <image_path> <output_base> [--cols 80] [--frames 60] [--fps 15] [--size 1080]
+Usage: python3 ascii-nft-gen.py <image_path> <output_base> [--cols 80] [--frames 60] [--fps 15] [--size 1080] [--engine direct|atlas|pillow] [--no-stream] [--seed ID] [--max-mb 2] [--loop 15] [--encoder auto|pyav|ffmpeg]
 Output: <output_base>.mp4 and <output_base>.png
 """
-import sys, os, random, colorsys, argparse, subprocess, tempfile, shutil
+import sys, os, argparse, subprocess, tempfile, shutil, threading, hashlib
+from collections import deque
 from PIL import Image, ImageDraw, ImageFont, ImageFilter, ImageEnhance
 import numpy as np
 
+try:
+    import av  # PyAV: optional in-process libav encoder
+except ImportError:
+    av = None
+
 RAMP = "$@B%8&WM#*oahkbdpqwmZO0QLCJUYXzcvunxrjft/\\|()1{}[]?-_+~<>i!lI;:,\"^`'. "
 CHARS = list("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789!@#$%^&*(){}[]<>?/\\|~+-=_:;,.")
 
+# Glyph table shared by RAMP and CHARS; BLANK is an extra empty slot for cells that draw nothing
+GLYPHS = "".join(dict.fromkeys(RAMP + "".join(CHARS)))
+GLYPH_INDEX = {ch: i for i, ch in enumerate(GLYPHS)}
+BLANK = len(GLYPHS)
+RAMP_GLYPHS = np.array([GLYPH_INDEX[ch] for ch in RAMP], dtype=np.uint8)
+CHAR_GLYPHS = np.array([GLYPH_INDEX[ch] for ch in CHARS], dtype=np.uint8)
+
+ENGINES = ("direct", "atlas", "pillow")
+ENCODERS = ("auto", "pyav", "ffmpeg")
+
+
+def x264_args(crf=23):
+    """libx264 output settings shared by the PNG-sequence and raw-pipe inputs."""
+    return [
+        '-c:v', 'libx264',
+        '-preset', 'ultrafast',
+        '-crf', str(crf),
+        '-pix_fmt', 'yuv420p',
+        '-movflags', '+faststart',
+        '-an',
+    ]
+
+
+CRF_RANGE = (18, 40)  # searched by fit_crf(); higher CRF = smaller file
+MIN_FRAMES = 8
+
+
+def piece_seed(piece_id):
+    """Stable 64-bit seed from a piece ID or source asset ID (any str), or an int used as-is."""
+    if isinstance(piece_id, (int, np.integer)):
+        return int(piece_id)
+    return int.from_bytes(hashlib.sha256(str(piece_id).encode()).digest()[:8], 'big')
+
+
+def rgb_to_hsv(rgb):
+    """Array version of colorsys.rgb_to_hsv for an (..., 3) float array in [0, 1]."""
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    maxc = rgb.max(axis=-1)
+    minc = rgb.min(axis=-1)
+    rangec = maxc - minc
+    gray = rangec == 0
+    safe_range = np.where(gray, 1.0, rangec)
+    s = np.where(gray, 0.0, rangec / np.where(maxc == 0, 1.0, maxc))
+    rc = (maxc - r) / safe_range
+    gc = (maxc - g) / safe_range
+    bc = (maxc - b) / safe_range
+    h = np.where(r == maxc, bc - gc, np.where(g == maxc, 2.0 + rc - bc, 4.0 + gc - rc))
+    h = np.where(gray, 0.0, np.mod(h / 6.0, 1.0))
+    return h, s, maxc
+
+
+def hsv_to_rgb(h, s, v):
+    """Array version of colorsys.hsv_to_rgb, returns an (..., 3) float array."""
+    i = (h * 6.0).astype(int)
+    f = h * 6.0 - i
+    p = v * (1.0 - s)
+    q = v * (1.0 - s * f)
+    t = v * (1.0 - s * (1.0 - f))
+    i = i % 6
+    r = np.choose(i, [v, q, p, p, t, v])
+    g = np.choose(i, [t, v, v, q, p, p])
+    b = np.choose(i, [p, p, t, v, v, q])
+    rgb = np.stack([r, g, b], axis=-1)
+    return np.where((s == 0.0)[..., None], v[..., None], rgb)
+
 
 def build_grid(img, cols=80):
-    """Build ASCII grid with green color mapping from image."""
+    """Build ASCII grid with green color mapping from image.
+
+    Returns (mask, idx, rgb) arrays of shape (rows, cols): mask is True for
+    foreground cells, idx is the uint8 index into RAMP and rgb the uint8
+    green-mapped color (zeroed on background cells).
+    """
     img = ImageEnhance.Contrast(img).enhance(1.4)
     img = ImageEnhance.Sharpness(img).enhance(2.0)
 
@@ -41,100 +117,316 @@ def build_grid(img, cols=80):
 
     small_arr = np.array(small)
 
-    grid = []
-    for y in range(rows):
-        row = []
-        for x in range(cols):
-            px = small_arr[y, x]
-            g = blended[y, x]
-
-            dist = np.sqrt(np.sum((px.astype(float) - bg_avg) ** 2))
-            if dist < threshold:
-                row.append(None)
-                continue
-
-            idx = int(g / 256 * len(RAMP))
-            idx = min(idx, len(RAMP) - 1)
+    # Background mask: cells close to the sampled corner color are skipped
+    dist = np.sqrt(np.sum((small_arr.astype(float) - bg_avg) ** 2, axis=2))
+    mask = dist >= threshold
 
-            r, gg, b = int(px[0]), int(px[1]), int(px[2])
-            h_orig, s_orig, v_orig = colorsys.rgb_to_hsv(r / 255, gg / 255, b / 255)
-            green_h = 0.33 + (h_orig - 0.33) * 0.4
-            green_h = max(0.12, min(0.52, green_h))
-            green_s = 0.6 + s_orig * 0.4
-            green_v = max(0.25, min(1.0, v_orig * 1.4 + 0.4))
-            r2, g2, b2 = colorsys.hsv_to_rgb(green_h, green_s, min(1.0, green_v))
+    idx = np.minimum(blended.astype(np.intp) * len(RAMP) // 256, len(RAMP) - 1).astype(np.uint8)
 
-            row.append((idx, int(r2 * 255), int(g2 * 255), int(b2 * 255)))
-        grid.append(row)
+    # Green remap in HSV space, vectorized colorsys.rgb_to_hsv / hsv_to_rgb
+    h_orig, s_orig, v_orig = rgb_to_hsv(small_arr / 255.0)
+    green_h = np.clip(0.33 + (h_orig - 0.33) * 0.4, 0.12, 0.52)
+    green_s = 0.6 + s_orig * 0.4
+    green_v = np.clip(v_orig * 1.4 + 0.4, 0.25, 1.0)
+    rgb = (hsv_to_rgb(green_h, green_s, green_v) * 255).astype(np.uint8)
+    rgb[~mask] = 0
 
-    return grid, rows, cols
+    return mask, idx, rgb
 
 
 class MatrixRain:
-    """Matrix rain streak manager."""
-    def __init__(self, cols, rows, max_streaks=25, spawn_rate=0.08):
+    """Matrix rain streak manager.
+
+    Streaks are kept as parallel arrays (x, y, speed, len) and the overlay is
+    emitted as dense per-cell arrays, so merging it into a frame is one
+    masked assignment. rng is a numpy Generator (fresh entropy if omitted).
+    """
+    def __init__(self, cols, rows, max_streaks=25, spawn_rate=0.08, rng=None):
         self.cols = cols
         self.rows = rows
         self.max_streaks = max_streaks
         self.spawn_rate = spawn_rate
-        self.streaks = []
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.x = np.zeros(0, dtype=np.intp)
+        self.y = np.zeros(0)
+        self.speed = np.zeros(0)
+        self.len = np.zeros(0, dtype=np.intp)
 
     def tick(self):
-        if len(self.streaks) < self.max_streaks and random.random() < self.spawn_rate:
-            self.streaks.append({
-                'x': random.randint(0, self.cols - 1),
-                'y': -random.random() * self.rows * 0.3,
-                'speed': 0.5 + random.random() * 0.6,
-                'len': 3 + random.randint(0, 6)
-            })
-        for s in self.streaks:
-            s['y'] += s['speed']
-        self.streaks = [s for s in self.streaks if s['y'] - s['len'] < self.rows]
+        rng = self.rng
+        if len(self.x) < self.max_streaks and rng.random() < self.spawn_rate:
+            self.x = np.append(self.x, rng.integers(0, self.cols))
+            self.y = np.append(self.y, -rng.random() * self.rows * 0.3)
+            self.speed = np.append(self.speed, 0.5 + rng.random() * 0.6)
+            self.len = np.append(self.len, 3 + rng.integers(0, 7))
+        self.y += self.speed
+        keep = self.y - self.len < self.rows
+        self.x, self.y, self.speed, self.len = self.x[keep], self.y[keep], self.speed[keep], self.len[keep]
 
     def get_overlay(self):
-        overlay = {}
-        for s in self.streaks:
-            for j in range(s['len']):
-                sy = int(s['y']) - j
-                if sy < 0 or sy >= self.rows:
-                    continue
-                ch = random.choice(CHARS)
-                if j == 0:
-                    overlay[(s['x'], sy)] = (ch, 220, 255, 220)
-                else:
-                    bright = max(0, 200 - j * 30)
-                    overlay[(s['x'], sy)] = (ch, 0, bright, 0)
-        return overlay
-
-
-def render_frame(grid, rows, cols, rain, rng, font, char_w, char_h, target_size=1080, flicker_rate=0.12):
-    """Render one frame as RGB PIL Image at target resolution."""
-    native_w = char_w * cols
-    native_h = char_h * rows
-
-    img = Image.new('RGB', (native_w, native_h), (0, 0, 0))
-    draw = ImageDraw.Draw(img)
+        """Returns (mask, glyphs, colors) arrays of shape (rows, cols) for rain cells."""
+        mask = np.zeros((self.rows, self.cols), dtype=bool)
+        glyphs = np.zeros((self.rows, self.cols), dtype=np.uint8)
+        colors = np.zeros((self.rows, self.cols, 3), dtype=np.uint8)
+        if not len(self.x):
+            return mask, glyphs, colors
+
+        # Cell j of each streak sits j rows above its head; int() truncates toward zero like the scalar version
+        j = np.arange(self.len.max())[None, :]
+        sy = self.y.astype(np.intp)[:, None] - j
+        valid = (j < self.len[:, None]) & (sy >= 0) & (sy < self.rows)
+        sy = sy[valid]
+        sx = np.broadcast_to(self.x[:, None], valid.shape)[valid]
+        sj = np.broadcast_to(j, valid.shape)[valid]
+
+        # Later streaks win where they overlap: keep the last write per cell
+        flat = sy * self.cols + sx
+        _, last = np.unique(flat[::-1], return_index=True)
+        keep = len(flat) - 1 - last
+        sy, sx, sj = sy[keep], sx[keep], sj[keep]
+
+        mask[sy, sx] = True
+        glyphs[sy, sx] = CHAR_GLYPHS[self.rng.integers(0, len(CHARS), len(sy))]
+        # Head: bright white-green; tail fades out
+        tail = np.zeros((len(sj), 3), dtype=np.intp)
+        tail[:, 1] = np.maximum(0, 200 - sj * 30)
+        colors[sy, sx] = np.where((sj == 0)[:, None], (220, 255, 220), tail)
+        return mask, glyphs, colors
+
+
+class LoopRain(MatrixRain):
+    """Rain whose frame t + period is identical to frame t, for seamless short loops.
+
+    Each rain column carries an endless train of streaks spaced
+    speed * period rows apart, so after one period every streak has moved
+    exactly into the place of the one ahead of it. Trains are never denser
+    than one streak on screen per column: a streak's speed is raised to
+    (rows + len) / period when the loop is too short for MatrixRain's
+    speed to carry it across, so short loops get faster rain rather than
+    solid stripes. Columns are added until the expected number of streaks
+    on screen matches MatrixRain's steady state for spawn_rate.
+    """
+    def __init__(self, cols, rows, period, max_streaks=25, spawn_rate=0.08, rng=None):
+        super().__init__(cols, rows, max_streaks, spawn_rate, rng)
+        rng = self.rng
+        # A MatrixRain streak (6 cells, 0.8 rows/frame on average) is on screen for (rows + 6) / 0.8 frames
+        target = min(max_streaks, spawn_rate * (rows + 6) / 0.8)
+        order = rng.permutation(cols)
+        columns, speeds, lens, shown = [], [], [], 0.0
+        while shown < target - 0.5 and len(columns) < cols:
+            length = 3 + int(rng.integers(0, 7))
+            speed = max(0.5 + rng.random() * 0.6, (rows + length) / period)
+            columns.append(order[len(columns)])
+            speeds.append(speed)
+            lens.append(length)
+            shown += (rows + length) / (speed * period)
+        self.period = period
+        self.columns = np.array(columns, dtype=np.intp)
+        self.speeds = np.array(speeds)
+        self.spacing = self.speeds * period
+        self.phase = rng.random(len(columns)) * self.spacing
+        self.lens = np.array(lens, dtype=np.intp)
+        self.t = -1
 
+    def tick(self):
+        self.t = (self.t + 1) % self.period
+        xs, ys, speeds, lens = [], [], [], []
+        for x, speed, spacing, phase, length in zip(self.columns, self.speeds, self.spacing, self.phase, self.lens):
+            head = phase + speed * self.t
+            # Every train member whose streak overlaps the screen
+            for m in range(int(np.ceil(-head / spacing)), int(np.floor((self.rows + length - head) / spacing)) + 1):
+                xs.append(x)
+                ys.append(head + m * spacing)
+                speeds.append(speed)
+                lens.append(length)
+        self.x = np.array(xs, dtype=np.intp)
+        self.y = np.array(ys, dtype=float)
+        self.speed = np.array(speeds, dtype=float)
+        self.len = np.array(lens, dtype=np.intp)
+
+
+def blend(dst, color, alpha):
+    """Pillow's integer "paste color through mask" arithmetic on int32 arrays."""
+    tmp = (color - dst) * alpha + 128
+    return dst + ((tmp + (tmp >> 8)) >> 8)
+
+
+class GlyphAtlas:
+    """Alpha masks of every glyph for one font/size, composed into frames with NumPy.
+
+    Glyphs can overhang their cell (DejaVu Sans Mono 14 is 9px wide in an 8px
+    cell), so each one is rasterized into a 2x2 cell box and split into
+    quadrants: its own cell plus spill into the right, lower and lower-right
+    neighbors. Pixels touched by spill are re-blended in draw order with
+    Pillow's arithmetic, which reproduces per-cell ImageDraw.text exactly.
+    """
+    def __init__(self, font, char_w, char_h):
+        self.char_w = char_w
+        self.char_h = char_h
+        masks = np.zeros((len(GLYPHS) + 1, 2 * char_h, 2 * char_w), dtype=np.uint8)
+        for i, ch in enumerate(GLYPHS):
+            box = Image.new('L', (2 * char_w, 2 * char_h), 0)
+            ImageDraw.Draw(box).text((0, 0), ch, fill=255, font=font)
+            masks[i] = np.array(box)
+
+        self.own = np.ascontiguousarray(masks[:, :char_h, :char_w])
+        # Spill layers in the order the neighbors are drawn: upper-left, upper, left
+        self.spills = []
+        for dy, dx in ((1, 1), (1, 0), (0, 1)):
+            quad = masks[:, dy * char_h:(dy + 1) * char_h, dx * char_w:(dx + 1) * char_w]
+            if quad.any():
+                self.spills.append((dy, dx, np.ascontiguousarray(quad)))
+
+    def compose_cells(self, glyphs, colors, r, c):
+        """Compose the blocks of cells (r, c) as a (3, n, char_h, char_w) uint8 array, channel-first."""
+        own_alpha = self.own[glyphs[r, c]]
+
+        # Blend onto black, channel-first so the color broadcasts over whole glyph blocks.
+        # Fits in uint16: c * a + 128 + ((c * a + 128) >> 8) < 65536
+        tmp = colors[r, c].T[:, :, None, None].astype(np.uint16) * own_alpha + 128
+        tmp += tmp >> 8
+        tmp >>= 8
+        blocks = tmp.astype(np.uint8)
+
+        if self.spills:
+            layers = []
+            hit = np.zeros(own_alpha.shape, dtype=bool)
+            for dy, dx, quad in self.spills:
+                sr, sc = r - dy, c - dx
+                g = np.where((sr >= 0) & (sc >= 0), glyphs[sr, sc], BLANK)
+                alpha = quad[g]
+                hit |= alpha > 0
+                layers.append((alpha, colors[sr, sc]))
+            layers.append((own_alpha, colors[r, c]))
+
+            k, py, px = np.nonzero(hit)
+            out = np.zeros((len(k), 3), dtype=np.int32)
+            for alpha, col in layers:
+                out = blend(out, col[k].astype(np.int32), alpha[k, py, px, None].astype(np.int32))
+            blocks[:, k, py, px] = out.T
+
+        return blocks
+
+    def compose(self, glyphs, colors):
+        """Compose a (rows*char_h, cols*char_w, 3) uint8 frame from per-cell glyph indices and colors."""
+        rows, cols = glyphs.shape
+        r, c = np.divmod(np.arange(rows * cols), cols)
+        blocks = self.compose_cells(glyphs, colors, r, c).reshape(3, rows, cols, self.char_h, self.char_w)
+        return blocks.transpose(1, 3, 2, 4, 0).reshape(rows * self.char_h, cols * self.char_w, 3)
+
+
+class LayerCache:
+    """Glyph-resolution frame kept across frames so only changed cells are recomposed.
+
+    The first frame composes the whole portrait. After that only cells whose
+    glyph or color differs from the previous frame (this and last frame's
+    flicker and rain) are recomposed, along with the neighbors their glyphs
+    spill into.
+    """
+    def __init__(self, atlas, rows, cols):
+        self.atlas = atlas
+        self.glyphs = None
+        self.colors = None
+        self.native = np.zeros((rows * atlas.char_h, cols * atlas.char_w, 3), dtype=np.uint8)
+        self.blocks = self.native.reshape(rows, atlas.char_h, cols, atlas.char_w, 3)
+
+    def update(self, glyphs, colors):
+        """Bring the cached frame up to date with this frame's cells and return it."""
+        if self.glyphs is None:
+            self.native[...] = self.atlas.compose(glyphs, colors)
+        else:
+            rows, cols = glyphs.shape
+            changed = (glyphs != self.glyphs) | (colors != self.colors).any(axis=2)
+            dirty = changed.copy()
+            for dy, dx, _ in self.atlas.spills:
+                dirty[dy:, dx:] |= changed[:rows - dy, :cols - dx]
+            r, c = np.nonzero(dirty)
+            self.blocks[r, :, c] = self.atlas.compose_cells(glyphs, colors, r, c).transpose(1, 2, 3, 0)
+
+        self.glyphs = glyphs
+        self.colors = colors
+        return self.native
+
+
+def nearest_map(n_in, n_out):
+    """Source index of each output pixel in a 1-D Image.NEAREST resize, taken from Pillow itself."""
+    line = Image.fromarray(np.arange(n_in, dtype=np.int32)[None, :])
+    return np.array(line.resize((n_out, 1), Image.NEAREST))[0].astype(np.intp)
+
+
+class FrameCanvas:
+    """Preallocated target_size x target_size RGB frame.
+
+    Same result as centering the glyph-resolution frame on a black square and
+    resizing it with Image.NEAREST, but the padding offsets and nearest
+    lookups are baked into index tables once, so each frame is one gather
+    into a reused buffer instead of two image allocations and a resize.
+    """
+    def __init__(self, native_w, native_h, target_size):
+        max_dim = max(native_w, native_h)
+        src = nearest_map(max_dim, target_size)
+        ys = src - (max_dim - native_h) // 2
+        xs = src - (max_dim - native_w) // 2
+        rows = np.nonzero((ys >= 0) & (ys < native_h))[0]
+        cols = np.nonzero((xs >= 0) & (xs < native_w))[0]
+
+        self.ys = ys[rows]
+        self.xs = xs[cols]
+        self.frame = np.zeros((target_size, target_size, 3), dtype=np.uint8)
+        self.view = self.frame[rows[0]:rows[-1] + 1, cols[0]:cols[-1] + 1]
+
+    def blit(self, native):
+        """Scale a (native_h, native_w, 3) frame into the buffer and return the buffer."""
+        np.take(np.take(native, self.xs, axis=1), self.ys, axis=0, out=self.view)
+        return self.frame
+
+
+def frame_cells(grid, overlay, rng, flicker_rate=0.12):
+    """Resolve one frame's per-cell glyph index and color (BLANK where nothing is drawn).
+
+    rng is the numpy Generator driving flicker.
+    """
+    mask, idx, rgb = grid
+    rain_mask, rain_glyphs, rain_colors = overlay
+    glyphs = np.where(mask, RAMP_GLYPHS[idx], np.uint8(BLANK))
+    colors = rgb.copy()
+
+    # Rain overrides the portrait
+    np.copyto(glyphs, rain_glyphs, where=rain_mask)
+    np.copyto(colors, rain_colors, where=rain_mask[..., None])
+
+    # Flicker: randomly change character but keep color
+    ys, xs = np.nonzero(mask & ~rain_mask)
+    hit = rng.random(len(ys)) < flicker_rate
+    glyphs[ys[hit], xs[hit]] = CHAR_GLYPHS[rng.integers(0, len(CHARS), hit.sum())]
+
+    return glyphs, colors
+
+
+def render_frame(grid, rain, rng, font, char_w, char_h, target_size=1080, flicker_rate=0.12, atlas=None, canvas=None,
+                 cache=None):
+    """Render one frame as a (target_size, target_size, 3) uint8 array.
+
+    With an atlas the frame is composed with NumPy; without one each cell is
+    drawn with ImageDraw.text. With a cache (a LayerCache over the same atlas)
+    only cells that changed since the previous frame are recomposed. With a
+    canvas the atlas output is scaled straight into the canvas buffer. Cache
+    and canvas buffers are reused by the next call.
+    """
     rain.tick()
-    overlay = rain.get_overlay()
-
-    for y in range(rows):
-        for x in range(cols):
-            if (x, y) in overlay:
-                ch, r, g, b = overlay[(x, y)]
-                draw.text((x * char_w, y * char_h), ch, fill=(r, g, b), font=font)
-                continue
-
-            cell = grid[y][x]
-            if cell is None:
-                continue
-
-            density_idx, r, g, b = cell
-            if rng.random() < flicker_rate:
-                ch = rng.choice(CHARS)
-            else:
-                ch = RAMP[density_idx]
-            draw.text((x * char_w, y * char_h), ch, fill=(r, g, b), font=font)
+    glyphs, colors = frame_cells(grid, rain.get_overlay(), rng, flicker_rate)
+
+    if atlas is not None:
+        native = cache.update(glyphs, colors) if cache is not None else atlas.compose(glyphs, colors)
+        if canvas is not None:
+            return canvas.blit(native)
+        img = Image.fromarray(native)
+    else:
+        rows, cols = glyphs.shape
+        img = Image.new('RGB', (char_w * cols, char_h * rows), (0, 0, 0))
+        draw = ImageDraw.Draw(img)
+        for y, x in zip(*np.nonzero(glyphs != BLANK)):
+            draw.text((x * char_w, y * char_h), GLYPHS[glyphs[y, x]], fill=tuple(colors[y, x].tolist()), font=font)
 
     # Pad to square + scale to target
     w, h = img.size
@@ -147,16 +439,223 @@ def render_frame(grid, rows, cols, rain, rng, font, char_w, char_h, target_size=
     if img.size[0] != target_size:
         img = img.resize((target_size, target_size), Image.NEAREST)
 
-    return img
-
+    return np.asarray(img)
+
+
+class FFmpegWriter:
+    """Streams raw rgb24 frames to an ffmpeg child over stdin.
+
+    Writes block while ffmpeg is busy, so rendering never runs ahead of the
+    encoder. stderr is drained on a thread (keeping the last lines for error
+    reports) so a chatty ffmpeg can't deadlock the pipe. If ffmpeg exits
+    early, write() and close() raise CalledProcessError with its stderr.
+    """
+    def __init__(self, path, width, height, fps, crf=23):
+        self.cmd = [
+            'ffmpeg', '-y', '-loglevel', 'error',
+            '-f', 'rawvideo', '-pix_fmt', 'rgb24',
+            '-s', f'{width}x{height}', '-framerate', str(fps),
+            '-i', '-',
+        ] + x264_args(crf) + [path]
+        self.frame_bytes = width * height * 3
+        self.proc = subprocess.Popen(self.cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+        self.stderr = deque(maxlen=50)
+        self.drain = threading.Thread(target=self._drain, daemon=True)
+        self.drain.start()
+
+    def _drain(self):
+        for line in self.proc.stderr:
+            self.stderr.append(line)
+
+    def _failed(self):
+        self.proc.wait()
+        self.drain.join()
+        return subprocess.CalledProcessError(self.proc.returncode, self.cmd, stderr=b"".join(self.stderr))
+
+    def write(self, frame):
+        """Write one (height, width, 3) uint8 frame without copying it."""
+        frame = np.ascontiguousarray(frame)
+        if frame.nbytes != self.frame_bytes:
+            raise ValueError(f"Frame is {frame.nbytes} bytes, expected {self.frame_bytes}")
+        try:
+            self.proc.stdin.write(memoryview(frame).cast('B'))
+        except (BrokenPipeError, OSError):
+            raise self._failed() from None
 
-def generate(image_path, output_base, cols=80, num_frames=60, fps=15, target_size=1080):
-    """Main pipeline: image → MP4 + PNG thumbnail."""
+    def close(self):
+        try:
+            self.proc.stdin.close()
+        except (BrokenPipeError, OSError):
+            pass
+        if self.proc.wait() != 0:
+            raise self._failed()
+        self.drain.join()
+
+    def abort(self):
+        self.proc.kill()
+        self.proc.wait()
+        self.drain.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class PyAVWriter:
+    """In-process FFmpegWriter: encodes NumPy frames with libx264 through PyAV.
+
+    No child process, pipe or stderr buffer per piece; in a long-lived
+    worker the libav libraries stay loaded across pieces. Same settings
+    as x264_args() and the same write/close/abort/context-manager API.
+    """
+    def __init__(self, path, width, height, fps, crf=23):
+        self.path = path
+        self.container = av.open(path, 'w', options={'movflags': '+faststart'})
+        self.stream = self.container.add_stream('libx264', rate=fps)
+        self.stream.width = width
+        self.stream.height = height
+        self.stream.pix_fmt = 'yuv420p'
+        self.stream.options = {'preset': 'ultrafast', 'crf': str(crf)}
+
+    def write(self, frame):
+        """Write one (height, width, 3) uint8 frame."""
+        video = av.VideoFrame.from_ndarray(np.ascontiguousarray(frame), format='rgb24')
+        self.container.mux(self.stream.encode(video))
+
+    def close(self):
+        self.container.mux(self.stream.encode(None))  # flush delayed frames
+        self.container.close()
+
+    def abort(self):
+        self.container.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def resolve_encoder(encoder):
+    """"auto" is PyAV when it is installed, else the ffmpeg binary."""
+    if encoder not in ENCODERS:
+        raise ValueError(f"Unknown encoder {encoder!r}, expected one of {ENCODERS}")
+    if encoder == "pyav" and av is None:
+        raise RuntimeError("encoder='pyav' needs PyAV (pip install av)")
+    if encoder == "auto":
+        return "pyav" if av is not None else "ffmpeg"
+    return encoder
+
+
+def open_writer(encoder, path, width, height, fps, crf=23):
+    """Frame writer for a resolved encoder ("pyav" or "ffmpeg")."""
+    writer = PyAVWriter if encoder == "pyav" else FFmpegWriter
+    return writer(path, width, height, fps, crf)
+
+
+def repeat_mp4(cycle_path, mp4_path, times, encoder="ffmpeg"):
+    """mp4_path = times back-to-back copies of cycle_path, stream-copied (no re-encode)."""
+    if encoder == "pyav":
+        with av.open(cycle_path) as src, av.open(mp4_path, 'w', options={'movflags': '+faststart'}) as dst:
+            source = src.streams.video[0]
+            stream = dst.add_stream_from_template(source)
+            packets = [p for p in src.demux(source) if p.size]
+            span = max(p.pts + p.duration for p in packets) - min(p.pts for p in packets)
+            for i in range(times):
+                for p in packets:
+                    p.stream = stream
+                    p.pts += span if i else 0
+                    p.dts += span if i else 0
+                    dst.mux(p)
+        return
+    subprocess.run([
+        'ffmpeg', '-y', '-loglevel', 'error',
+        '-stream_loop', str(times - 1), '-i', cycle_path,
+        '-c', 'copy', '-movflags', '+faststart', mp4_path,
+    ], check=True, capture_output=True)
+
+
+def encoded_size(frames, fps, crf, encoder="ffmpeg"):
+    """Bytes of an MP4 of frames at crf (a trial encode to a temp file)."""
+    fd, path = tempfile.mkstemp(suffix='.mp4')
+    os.close(fd)
+    try:
+        height, width = frames[0].shape[:2]
+        with open_writer(encoder, path, width, height, fps, crf) as writer:
+            for frame in frames:
+                writer.write(frame)
+        return os.path.getsize(path)
+    finally:
+        os.remove(path)
+
+
+def fit_crf(sample, fps, num_frames, max_bytes, crf_range=CRF_RANGE, encoder="ffmpeg"):
+    """Best-quality settings whose MP4 should fit max_bytes: (crf, num_frames).
+
+    Bisects CRF over crf_range with trial encodes of sample (a few
+    consecutive frames), scaling each trial size to num_frames. Only if the
+    highest CRF is still over budget is the frame count cut, proportionally
+    and never below MIN_FRAMES.
+    """
+    scale = num_frames / len(sample)
+    lo, hi = crf_range
+    at_hi = encoded_size(sample, fps, hi, encoder) * scale
+    if at_hi > max_bytes:
+        return hi, max(min(MIN_FRAMES, num_frames), int(num_frames * max_bytes / at_hi))
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if encoded_size(sample, fps, mid, encoder) * scale <= max_bytes:
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo, num_frames
+
+
+def generate(image_path, output_base, cols=80, num_frames=60, fps=15, target_size=1080, engine="direct", stream=True,
+             seed=None, max_bytes=None, trial_frames=12, loop=None, encoder="auto"):
+    """Main pipeline: image → MP4 + PNG thumbnail.
+
+    engine: "direct" (glyph atlas, recomposing only changed cells and scaling
+    straight into a preallocated target frame), "atlas" (glyph atlas, then Pillow pad + resize) or "pillow"
+    (per-cell ImageDraw.text). All three produce identical frames.
+    stream: pipe raw frames into ffmpeg as they render; False writes a PNG
+    sequence to a temp dir and encodes it afterwards.
+    seed: piece ID / source asset ID (or int) that all rain and flicker
+    randomness derives from; defaults to the output base name, so re-rendering
+    a piece reproduces it byte for byte.
+    max_bytes: MP4 size budget. trial_frames consecutive frames from mid-clip
+    are rendered first and fit_crf() picks the CRF (and, failing that, the
+    frame count) from trial encodes; then the piece is rendered again from
+    the same seed and encoded once.
+    loop: cycle length in frames. Rain follows a periodic schedule
+    (LoopRain), only one cycle is rendered and encoded, and ffmpeg repeats
+    it by stream copy up to num_frames (rounded to whole cycles, so the
+    file itself loops seamlessly too). Under max_bytes, a cycle that does
+    not fit its share at the highest CRF is repeated fewer times before it
+    is cut short.
+    encoder: "pyav" (in-process libav, needs PyAV), "ffmpeg" (the ffmpeg
+    binary over a pipe) or "auto" (PyAV if installed). stream=False always
+    encodes its PNG sequence with the ffmpeg binary.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine {engine!r}, expected one of {ENGINES}")
+    encoder = resolve_encoder(encoder) if stream else "ffmpeg"
     print(f"Loading {image_path}...")
     src = Image.open(image_path).convert('RGB')
 
     print(f"Building ASCII grid ({cols} cols)...")
-    grid, rows, grid_cols = build_grid(src, cols)
+    grid = build_grid(src, cols)
+    rows, grid_cols = grid[0].shape
     print(f"Grid: {grid_cols}x{rows}")
 
     # Font setup
@@ -172,51 +671,106 @@ def generate(image_path, output_base, cols=80, num_frames=60, fps=15, target_siz
     char_w = max(1, int(font.getlength("M")))
     char_h = font_size + 2
 
-    rain = MatrixRain(grid_cols, rows)
-    rng = random.Random(42)
-
-    # Create temp dir for frames
-    tmpdir = tempfile.mkdtemp(prefix='ascii_frames_')
-
-    try:
-        print(f"Rendering {num_frames} frames at {target_size}x{target_size}...")
-        for i in range(num_frames):
-            frame = render_frame(grid, rows, grid_cols, rain, rng, font, char_w, char_h, target_size)
-            frame.save(os.path.join(tmpdir, f'frame_{i:04d}.png'))
+    atlas = GlyphAtlas(font, char_w, char_h) if engine != "pillow" else None
+    canvas = FrameCanvas(char_w * grid_cols, char_h * rows, target_size) if engine == "direct" else None
+
+    if seed is None:
+        seed = os.path.basename(output_base)
+
+    cycle = loop if loop and loop < num_frames else None
+    if cycle:
+        repeats = max(1, round(num_frames / cycle))
+        num_frames = cycle * repeats
+
+    def start():
+        """Fresh rain, flicker and cache state; the same seed replays the same frames."""
+        rain_rng, rng = (np.random.default_rng(s) for s in np.random.SeedSequence(piece_seed(seed)).spawn(2))
+        cache = LayerCache(atlas, rows, grid_cols) if engine == "direct" else None
+        rain = LoopRain(grid_cols, rows, cycle, rng=rain_rng) if cycle else MatrixRain(grid_cols, rows, rng=rain_rng)
+        return rain, rng, cache
+
+    crf = 23
+    if max_bytes:
+        window = min(trial_frames, cycle or num_frames)
+        first = (num_frames - window) // 2  # mid-clip, once the rain has built up
+        rain, rng, cache = start()
+        sample = []
+        for i in range(first + window):
+            frame = render_frame(grid, rain, rng, font, char_w, char_h, target_size,
+                                 atlas=atlas, canvas=canvas, cache=cache)
+            if i >= first:
+                sample.append(frame.copy())
+        crf, fit = fit_crf(sample, fps, cycle or num_frames, max_bytes / (repeats if cycle else 1), encoder=encoder)
+        if cycle and fit < cycle and repeats > 1:
+            # Each stream-copied repeat costs a whole cycle of bytes: play fewer cycles before cutting one short
+            cycle_bytes = encoded_size(sample, fps, crf, encoder) * cycle / len(sample)
+            repeats = max(1, min(repeats - 1, int(max_bytes // cycle_bytes)))
+            crf, fit = fit_crf(sample, fps, cycle, max_bytes / repeats, encoder=encoder)
+        print(f"Budget {max_bytes / 1024 / 1024:.2f}MB: crf {crf}"
+              + (f", {fit} frames" if fit < (cycle or num_frames) else "")
+              + (f", cycle x{repeats}" if cycle else ""))
+        if cycle:
+            cycle, num_frames = fit, fit * repeats
+        else:
+            num_frames = fit
+
+    mp4_path = output_base + '.mp4'
+    png_path = output_base + '.png'
+    rendered = cycle or num_frames
+    encode_path = output_base + '.cycle.mp4' if cycle else mp4_path
+
+    def frames():
+        rain, rng, cache = start()
+        print(f"Rendering {rendered} frames at {target_size}x{target_size}"
+              + (f" (loop of {rendered} x {repeats} = {num_frames} frames)..." if cycle else "..."))
+        for i in range(rendered):
+            frame = render_frame(grid, rain, rng, font, char_w, char_h, target_size,
+                                 atlas=atlas, canvas=canvas, cache=cache)
 
             # Save first frame as thumbnail
             if i == 0:
-                png_path = output_base + '.png'
-                frame.save(png_path, optimize=True)
+                Image.fromarray(frame).save(png_path, optimize=True)
                 png_size = os.path.getsize(png_path) / 1024
                 print(f"Thumbnail: {png_path} ({png_size:.0f}KB)")
 
+            yield i, frame
             if (i + 1) % 10 == 0:
-                print(f"  Frame {i + 1}/{num_frames}")
-
-        # Encode MP4 with ffmpeg
-        mp4_path = output_base + '.mp4'
-        print(f"Encoding MP4 ({fps}fps)...")
-        subprocess.run([
-            'ffmpeg', '-y',
-            '-framerate', str(fps),
-            '-i', os.path.join(tmpdir, 'frame_%04d.png'),
-            '-c:v', 'libx264',
-            '-preset', 'ultrafast',
-            '-crf', '23',
-            '-pix_fmt', 'yuv420p',
-            '-vf', f'scale={target_size}:{target_size}:flags=neighbor',
-            '-movflags', '+faststart',
-            '-an',
-            mp4_path
-        ], check=True, capture_output=True)
-
-        mp4_size = os.path.getsize(mp4_path) / 1024
-        print(f"MP4: {mp4_path} ({mp4_size:.0f}KB / {mp4_size/1024:.2f}MB)")
-        print(f"Done!")
+                print(f"  Frame {i + 1}/{rendered}")
+
+    if stream:
+        # Pipe raw frames straight into ffmpeg as they are rendered
+        print(f"Encoding MP4 ({fps}fps, streaming via {encoder})...")
+        with open_writer(encoder, encode_path, target_size, target_size, fps, crf) as writer:
+            for i, frame in frames():
+                writer.write(frame)
+    else:
+        # Create temp dir for frames
+        tmpdir = tempfile.mkdtemp(prefix='ascii_frames_')
+        try:
+            for i, frame in frames():
+                Image.fromarray(frame).save(os.path.join(tmpdir, f'frame_{i:04d}.png'))
+
+            # Encode MP4 with ffmpeg
+            print(f"Encoding MP4 ({fps}fps)...")
+            subprocess.run([
+                'ffmpeg', '-y',
+                '-framerate', str(fps),
+                '-i', os.path.join(tmpdir, 'frame_%04d.png'),
+            ] + x264_args(crf) + [encode_path], check=True, capture_output=True)
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
+    if cycle:
+        try:
+            repeat_mp4(encode_path, mp4_path, repeats, encoder)
+        finally:
+            os.remove(encode_path)
 
-    finally:
-        shutil.rmtree(tmpdir, ignore_errors=True)
+    mp4_size = os.path.getsize(mp4_path) / 1024
+    print(f"MP4: {mp4_path} ({mp4_size:.0f}KB / {mp4_size/1024:.2f}MB)")
+    if max_bytes and mp4_size * 1024 > max_bytes:
+        print(f"⚠️  Over {max_bytes / 1024 / 1024:.2f}MB budget!")
+    print(f"Done!")
 
     return mp4_path, png_path
 
@@ -229,6 +783,16 @@ if __name__ == "__main__":
     parser.add_argument("--frames", type=int, default=60, help="Number of frames (default 60)")
     parser.add_argument("--fps", type=int, default=15, help="Frames per second (default 15)")
     parser.add_argument("--size", type=int, default=1080, help="Output resolution (default 1080)")
+    parser.add_argument("--engine", choices=ENGINES, default="direct", help="Frame renderer (default direct)")
+    parser.add_argument("--no-stream", dest="stream", action="store_false", help="Encode from a temp PNG sequence instead of piping raw frames")
+    parser.add_argument("--seed", help="Piece or source asset ID seeding all randomness (default: output base name)")
+    parser.add_argument("--max-mb", type=float, help="MP4 size budget; picks CRF (then frame count) to fit")
+    parser.add_argument("--loop", type=int, help="Render one seamless cycle of this many frames and repeat it to --frames")
+    parser.add_argument("--encoder", choices=ENCODERS, default="auto",
+                        help="pyav (in-process), ffmpeg (subprocess) or auto (pyav if installed; default)")
     args = parser.parse_args()
 
-    generate(args.image, args.output, cols=args.cols, num_frames=args.frames, fps=args.fps, target_size=args.size)
+    generate(args.image, args.output, cols=args.cols, num_frames=args.frames, fps=args.fps, target_size=args.size,
+             engine=args.engine, stream=args.stream, seed=args.seed,
+             max_bytes=int(args.max_mb * 1024 * 1024) if args.max_mb else None, loop=args.loop,
+             encoder=args.encoder)
@@ -21,6 +21,8 @@ spec = importlib.util.spec_from_file_location(
 ascii_gen = importlib.util.module_from_spec(spec)
 spec.loader.exec_module(ascii_gen)
 
+from poolgen import SupabaseStorage
+
 # ─── Config ───
 SOURCE_COLLECTIONS = [
     {"address": "J1S9H3QjnRtBbbuD4HjPV6RpRhwuk4zKbxsnCHuTgh9w"},
@@ -32,6 +34,7 @@ HELIUS_API_KEY = os.environ.get("HELIUS_API_KEY", "")
 SUPABASE_URL = os.environ.get("SUPABASE_URL", "")
 SUPABASE_SERVICE_KEY = os.environ.get("SUPABASE_SERVICE_KEY", "")
 BUCKET = "art-pool"
+STORAGE = SupabaseStorage(SUPABASE_URL, SUPABASE_SERVICE_KEY, BUCKET) if SUPABASE_URL else None
 
 
 def helius_rpc(method, params):
@@ -74,26 +77,13 @@ def download_image(url, dest):
     return os.path.getsize(dest) > 0
 
 
-def upload_to_supabase(local_path, remote_path, content_type):
-    """Upload a file to Supabase Storage via REST API."""
-    url = f"{SUPABASE_URL}/storage/v1/object/{BUCKET}/{remote_path}"
-    result = subprocess.run([
-        "curl", "-s", "-X", "POST", url,
-        "-H", f"Authorization: Bearer {SUPABASE_SERVICE_KEY}",
-        "-H", f"Content-Type: {content_type}",
-        "-H", "x-upsert: true",
-        "--data-binary", f"@{local_path}",
-    ], capture_output=True, text=True, timeout=60)
-    resp = result.stdout
+def upload_to_supabase(local_path, remote_path):
+    """Upload a file to Supabase Storage over the shared keep-alive pool."""
     try:
-        data = json.loads(resp)
-        if "error" in data or "statusCode" in data:
-            print(f"  ⚠ Upload error: {resp}")
-            return None
-    except json.JSONDecodeError:
-        pass
-    # Return public URL
-    return f"{SUPABASE_URL}/storage/v1/object/public/{BUCKET}/{remote_path}"
+        return STORAGE.upload(local_path, remote_path)
+    except Exception as e:
+        print(f"  ⚠ Upload error: {e}", flush=True)
+        return None
 
 
 def get_nft_image_url(item):
@@ -232,8 +222,8 @@ def generate_pool(count=30):
                 
                 # Upload to Supabase Storage
                 print(f"  ↑ Uploading to Supabase...")
-                mp4_url = upload_to_supabase(mp4_path, f"{piece_id}.mp4", "video/mp4")
-                png_url = upload_to_supabase(png_path, f"{piece_id}.png", "image/png")
+                mp4_url = upload_to_supabase(mp4_path, f"{piece_id}.mp4")
+                png_url = upload_to_supabase(png_path, f"{piece_id}.png")
                 
                 if not mp4_url or not png_url:
                     print(f"  ✗ {nft_id} — upload failed")
@@ -1,19 +1,14 @@
 #!/usr/bin/env python3
 """Fast Batch ASCII Art Pool Generator — parallelized, fewer frames.
-Usage: python3 fast-pool-gen.py --count 30 --workers 4
+Download, render and upload run as separate pipelined stages: renders in a
+process pool (one per core by default), downloads and uploads on threads.
+Usage: python3 fast-pool-gen.py --count 30 [--workers N]
 """
-import os, sys, json, random, tempfile, shutil, subprocess, argparse, time
+import os, sys, json, random, tempfile, shutil, argparse, time
 import urllib.request, urllib.error
-from multiprocessing import Pool as MPPool, cpu_count
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-import importlib.util
-spec = importlib.util.spec_from_file_location(
-    "ascii_nft_gen",
-    os.path.join(os.path.dirname(os.path.abspath(__file__)), "ascii-nft-gen.py")
-)
-ascii_gen = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(ascii_gen)
+from poolgen import Pipeline, SupabaseStorage
 
 SOURCE_COLLECTIONS = [
     {"address": "J1S9H3QjnRtBbbuD4HjPV6RpRhwuk4zKbxsnCHuTgh9w"},
@@ -25,6 +20,7 @@ HELIUS_API_KEY = os.environ.get("HELIUS_API_KEY", "")
 SUPABASE_URL = os.environ.get("SUPABASE_URL", "")
 SUPABASE_SERVICE_KEY = os.environ.get("SUPABASE_SERVICE_KEY", "")
 BUCKET = "art-pool"
+STORAGE = SupabaseStorage(SUPABASE_URL, SUPABASE_SERVICE_KEY, BUCKET) if SUPABASE_URL else None
 
 NUM_FRAMES = 8
 FPS = 4
@@ -78,63 +74,49 @@ def download_image(url, dest):
     return os.path.getsize(dest) > 0
 
 
-def upload_to_supabase(local_path, remote_path, content_type):
-    url = f"{SUPABASE_URL}/storage/v1/object/{BUCKET}/{remote_path}"
-    result = subprocess.run([
-        "curl","-s","-X","POST",url,
-        "-H",f"Authorization: Bearer {SUPABASE_SERVICE_KEY}",
-        "-H",f"Content-Type: {content_type}",
-        "-H","x-upsert: true",
-        "--data-binary",f"@{local_path}",
-    ], capture_output=True, text=True, timeout=60)
+def upload_to_supabase(local_path, remote_path):
+    """Upload a file to Supabase Storage over the shared keep-alive pool."""
     try:
-        data = json.loads(result.stdout)
-        if "error" in data or "statusCode" in data: return None
-    except: pass
-    return f"{SUPABASE_URL}/storage/v1/object/public/{BUCKET}/{remote_path}"
+        return STORAGE.upload(local_path, remote_path)
+    except Exception as e:
+        print(f"  ⚠ Upload error: {e}", flush=True)
+        return None
 
 
-def process_single_nft(args):
-    """Worker function: download, generate, upload one NFT."""
+def fetch_one(args):
+    """Fetch stage: resolve and download one NFT's image."""
     nft, tmpdir, seq_num = args
     nft_id = nft.get("id","unknown")[:8]
     image_url = get_nft_image_url(nft)
     if not image_url:
         return None
 
-    img_path = os.path.join(tmpdir, f"src_{nft_id}_{os.getpid()}.png")
+    img_path = os.path.join(tmpdir, f"src_{nft_id}_{seq_num}.png")
     try:
         download_image(image_url, img_path)
     except:
         return None
 
-    piece_id = f"CHUM-{nft_id}-{int(time.time())}-{os.getpid()}"
-    output_base = os.path.join(tmpdir, piece_id)
-    try:
-        mp4_path, png_path = ascii_gen.generate(
-            img_path, output_base,
-            cols=COLS, num_frames=NUM_FRAMES, fps=FPS, target_size=TARGET_SIZE
-        )
-    except Exception as e:
-        print(f"  ✗ {nft_id} gen failed: {e}", flush=True)
-        return None
+    piece_id = f"CHUM-{nft_id}-{int(time.time())}-{seq_num}"
+    return img_path, os.path.join(tmpdir, piece_id)
+
 
+def upload_one(args, mp4_path, png_path):
+    """Upload stage: push one rendered piece to Supabase."""
+    piece_id = os.path.splitext(os.path.basename(mp4_path))[0]
     mp4_size = os.path.getsize(mp4_path) / 1024
     png_size = os.path.getsize(png_path) / 1024
 
-    mp4_url = upload_to_supabase(mp4_path, f"{piece_id}.mp4", "video/mp4")
-    png_url = upload_to_supabase(png_path, f"{piece_id}.png", "image/png")
+    mp4_url = upload_to_supabase(mp4_path, f"{piece_id}.mp4")
+    png_url = upload_to_supabase(png_path, f"{piece_id}.png")
 
     if not mp4_url or not png_url:
         return None
 
-    # Clean up local files
-    for p in [img_path, mp4_path, png_path]:
+    # Clean up local files (the run's tmpdir goes at the end regardless)
+    for p in [mp4_path, png_path]:
         try: os.remove(p)
         except: pass
-    # Clean frame dir
-    frame_dir = os.path.join(tmpdir, f"ascii_frames_*")
-    
     print(f"  ✓ {piece_id} (MP4:{mp4_size:.0f}KB, PNG:{png_size:.0f}KB)", flush=True)
     return {
         "piece_id": piece_id, "mp4_url": mp4_url, "png_url": png_url,
@@ -142,12 +124,12 @@ def process_single_nft(args):
     }
 
 
-def generate_pool(count=30, workers=4):
+def generate_pool(count=30, workers=None):
     if not HELIUS_API_KEY or not SUPABASE_URL or not SUPABASE_SERVICE_KEY:
         print("ERROR: Set env vars"); sys.exit(1)
 
     print(f"═══ Fast Art Pool Generator ═══", flush=True)
-    print(f"Target: {count} | Frames: {NUM_FRAMES} | Workers: {workers}\n", flush=True)
+    print(f"Target: {count} | Frames: {NUM_FRAMES} | Workers: {workers or os.cpu_count()}\n", flush=True)
 
     per_collection = count // len(SOURCE_COLLECTIONS)
     remainder = count % len(SOURCE_COLLECTIONS)
@@ -167,13 +149,14 @@ def generate_pool(count=30, workers=4):
             work_items.append((nft, tmpdir, seq_num))
 
     # Process in parallel
-    print(f"\n🚀 Processing {len(work_items)} items with {workers} workers...", flush=True)
+    print(f"\n🚀 Processing {len(work_items)} items...", flush=True)
     results = []
-    
-    # Use sequential for now since ascii_gen may not be fork-safe
-    for i, item in enumerate(work_items):
-        result = process_single_nft(item)
-        if result:
+    pipeline = Pipeline(fetch_one, upload_one, render_workers=workers,
+                        cols=COLS, num_frames=NUM_FRAMES, fps=FPS, target_size=TARGET_SIZE)
+    for i, (item, result) in enumerate(pipeline.run(work_items)):
+        if isinstance(result, Exception):
+            print(f"  ✗ {item[0].get('id','unknown')[:8]}: {result}", flush=True)
+        elif result:
             results.append(result)
         print(f"  Progress: {i+1}/{len(work_items)} ({len(results)} success)", flush=True)
 
@@ -201,6 +184,6 @@ def generate_pool(count=30, workers=4):
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--count", type=int, default=30)
-    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=None, help="Render processes (default: CPU count)")
     args = parser.parse_args()
     generate_pool(args.count, args.workers)
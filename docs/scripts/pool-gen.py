@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+"""Art Pool Generator — fetch → render → upload for any configured collection.
+Collections and their sources (Helius collection/creator, Alchemy contract,
+direct URL template) live in pool-sources.json.
+Usage: python3 pool-gen.py critters:300 smb:300 [--frames 8 --fps 4] [--workers N]
+Env: HELIUS_API_KEY, ALCHEMY_API_KEY, SUPABASE_URL, SUPABASE_SERVICE_KEY (or backend/.env)
+"""
+import os, sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from poolgen.cli import main
+
+if __name__ == "__main__":
+    main()
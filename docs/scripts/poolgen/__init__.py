@@ -0,0 +1,18 @@
+"""Shared core for the art-pool generators.
+
+engine.py    process-pool renderer (ascii-nft-gen)
+pipeline.py  fetch → render → upload stages
+sources.py   collection adapters (Helius, Alchemy, URL template)
+storage.py   Supabase Storage client
+cache.py     local content-addressed source image cache
+index.py     SQLite index of source assets and their status
+manifest.py  pool-manifest.json
+cli.py       pool-gen.py / gen-*.py entry point, driven by pool-sources.json
+"""
+from .engine import RenderPool, load_ascii_gen, input_hash
+from .pipeline import Pipeline, Skip
+from .sources import Asset, SOURCES, make_source
+from .storage import SupabaseStorage
+from .cache import ImageCache
+from .index import AssetIndex
+from .manifest import Manifest
@@ -0,0 +1,94 @@
+"""On-disk cache of downloaded source images.
+
+Blobs are content-addressed (objects/<sha256>), so one image reached
+through several URLs or gateways is stored once. Lookups go through keys:
+the IPFS CID when the URL has one (any gateway hits), otherwise the URL.
+Each key is a small file naming its blob. Hits touch the blob's mtime and
+the cache evicts least-recently-used blobs once it grows past max_bytes.
+All writes are write-to-temp + os.replace, so concurrent fetch threads
+and overlapping runs never see partial files.
+"""
+import os, hashlib, tempfile, threading
+
+from .net import CID_RE
+
+DEFAULT_ROOT = os.path.join(os.path.expanduser("~"), ".cache", "chum-pool", "images")
+
+
+def cache_key(url):
+    m = CID_RE.search(url)
+    return "cid:" + m.group(1) if m else "url:" + url
+
+
+class ImageCache:
+    def __init__(self, root=DEFAULT_ROOT, max_bytes=2 << 30):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.objects = os.path.join(root, "objects")
+        self.keys = os.path.join(root, "keys")
+        os.makedirs(self.objects, exist_ok=True)
+        os.makedirs(self.keys, exist_ok=True)
+        self.lock = threading.Lock()
+        self.hits = self.misses = 0
+        self.size = sum(e.stat().st_size for e in os.scandir(self.objects) if e.is_file())
+
+    def _key_path(self, url):
+        return os.path.join(self.keys, hashlib.sha256(cache_key(url).encode()).hexdigest())
+
+    def _write(self, path, data):
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path))
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def get(self, urls):
+        """Path of the cached blob for any of urls, or None."""
+        for url in urls:
+            try:
+                with open(self._key_path(url)) as f:
+                    blob = os.path.join(self.objects, f.read().strip())
+                os.utime(blob)
+            except OSError:
+                continue
+            with self.lock:
+                self.hits += 1
+            return blob
+        with self.lock:
+            self.misses += 1
+        return None
+
+    def put(self, urls, data):
+        """Store data under every url's key; returns the blob path."""
+        digest = hashlib.sha256(data).hexdigest()
+        blob = os.path.join(self.objects, digest)
+        if not os.path.exists(blob):
+            self._write(blob, data)
+            with self.lock:
+                self.size += len(data)
+        for url in urls:
+            self._write(self._key_path(url), digest.encode())
+        if self.size > self.max_bytes:
+            self.evict()
+        return blob
+
+    def evict(self):
+        """Delete least-recently-used blobs until the cache is at 90% of max_bytes.
+
+        Key files left pointing at evicted blobs are harmless misses.
+        """
+        with self.lock:
+            entries = sorted((e.stat().st_mtime, e.stat().st_size, e.path)
+                             for e in os.scandir(self.objects) if e.is_file())
+            size = sum(s for _, s, _ in entries)
+            for _, s, path in entries:
+                if size <= self.max_bytes * 0.9:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                size -= s
+            self.size = size
+
+    def summary(self):
+        return f"{self.hits} hits, {self.misses} misses, {self.size / 1024 / 1024:.0f}MB cached"
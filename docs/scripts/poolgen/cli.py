@@ -0,0 +1,278 @@
+"""Pool generator command line: fetch → render → upload pieces for configured collections.
+
+Usage: python3 pool-gen.py critters:300 smb:300 chimpers [--frames 8 --fps 4] [--config pool-sources.json]
+       python3 pool-gen.py --regen [collections] [--frames 60 ...]
+A collection without :count generates every asset not already in the pool.
+Pieces get neutral CHUM-NNNN names continuing from the manifest.
+--regen re-renders existing pieces in place, skipping every piece whose
+input hash (source bytes, generator version, settings, seed) is unchanged.
+Candidates come from the local asset index while its last sweep of a
+collection is fresh; --refresh sweeps the APIs anyway.
+"""
+import os, sys, random, shutil, tempfile, argparse, threading
+
+from . import net
+from .cache import ImageCache
+from .config import DEFAULT_CONFIG, load_config, load_env
+from .engine import input_hash
+from .index import AssetIndex
+from .manifest import Manifest
+from .pipeline import Pipeline, Skip
+from .sources import Asset, make_source
+from .storage import SupabaseStorage
+
+
+class Job:
+    """One asset on its way through the pipeline."""
+    __slots__ = ("key", "asset", "number", "workdir", "input_hash")
+
+    def __init__(self, key, asset, number=None):
+        self.key = key
+        self.asset = asset
+        self.number = number
+        self.workdir = None
+        self.input_hash = None
+
+    @property
+    def piece_id(self):
+        return f"CHUM-{self.number:04d}"
+
+
+def parse_targets(specs, collections):
+    targets = []
+    for spec in specs:
+        key, _, count = spec.partition(":")
+        if key not in collections:
+            raise SystemExit(f"Unknown collection {key!r}; configured: {', '.join(collections)}")
+        targets.append((key, int(count) if count else None))
+    return targets
+
+
+class Candidates:
+    """Assets of one collection that are not in the pool yet, in random order.
+
+    With an index that swept the collection recently these come straight
+    from it. Otherwise the source streams in the background (through the
+    index, if any) and picks are drawn at random from a window of what has
+    arrived, so rendering starts after the first page.
+    """
+
+    def __init__(self, key, spec, count, manifest, index=None, window=200):
+        self.manifest = manifest
+        self.window = window
+        self.buffer = []
+        self.sweep = index is not None and not index.fresh(key)
+        if index is not None and not self.sweep:
+            print(f"  {key}: from index ({index.summary(key)})", flush=True)
+            self.stream = index.candidates(key, Asset)
+        elif self.sweep:
+            self.stream = index.record(key, make_source(key, spec))
+        else:
+            source = make_source(key, spec)
+            # Spares for failures/dupes; sources without API calls stream everything
+            self.stream = source.stream(None if count is None or not source.api else count * 3)
+
+    def _fill(self):
+        while self.stream is not None and len(self.buffer) < self.window:
+            asset = next(self.stream, None)
+            if asset is None:
+                self.stream = None
+            elif not self.manifest.has(asset.source_id):
+                self.buffer.append(asset)
+
+    def __bool__(self):
+        self._fill()
+        return bool(self.buffer)
+
+    def pop(self):
+        self._fill()
+        i = random.randrange(len(self.buffer))
+        self.buffer[i], self.buffer[-1] = self.buffer[-1], self.buffer[i]
+        return self.buffer.pop()
+
+    def finish(self):
+        """Read the rest of an index sweep so the next run can skip the API."""
+        if self.sweep and self.stream is not None:
+            for _ in self.stream:
+                pass
+            self.stream = None
+
+
+def regen_jobs(manifest, keys=None):
+    """Jobs re-rendering every existing piece (of collections keys) under its own ID."""
+    jobs = []
+    for piece_id, src in manifest.sources().items():
+        if keys is None or src["collection"] in keys:
+            jobs.append(Job(src["collection"], Asset(src["source_id"], src["urls"]), int(piece_id.removeprefix("CHUM-"))))
+    return jobs
+
+
+class Feeder:
+    """Round-robin over the collections, keeping at most count pieces done or in flight each."""
+
+    def __init__(self, queues, counts):
+        self.queues = queues
+        self.counts = counts
+        self.ok = dict.fromkeys(queues, 0)
+        self.inflight = dict.fromkeys(queues, 0)
+        self.cond = threading.Condition()
+
+    def _room(self, key):
+        count = self.counts[key]
+        return count is None or self.ok[key] + self.inflight[key] < count
+
+    def __iter__(self):
+        while True:
+            with self.cond:
+                while True:
+                    live = [k for k, q in self.queues.items()
+                            if (self.counts[k] is None or self.ok[k] < self.counts[k]) and q]
+                    if not live:
+                        return
+                    ready = [k for k in live if self._room(k)]
+                    if ready:
+                        break
+                    self.cond.wait()
+                jobs = []
+                for key in ready:
+                    self.inflight[key] += 1
+                    jobs.append(Job(key, self.queues[key].pop()))
+            yield from jobs
+
+    def finished(self, job, ok):
+        with self.cond:
+            self.inflight[job.key] -= 1
+            self.ok[job.key] += ok
+            self.cond.notify()
+
+
+def run(targets, config, render_workers=None, regen=False, refresh=False, **render_overrides):
+    load_env()
+    if not os.environ.get("SUPABASE_URL") or not os.environ.get("SUPABASE_SERVICE_KEY"):
+        raise SystemExit("ERROR: Set SUPABASE_URL and SUPABASE_SERVICE_KEY (env or backend/.env)")
+    workers = config.get("workers", {})
+    storage = SupabaseStorage(os.environ["SUPABASE_URL"], os.environ["SUPABASE_SERVICE_KEY"], config["bucket"],
+                              pool_size=workers.get("upload", 8))
+    manifest = Manifest(config["manifest"], storage, config.get("manifest_compact_every", 200),
+                        config.get("manifest_shard_size", 500))
+    print(f"Pool: {len(manifest)} pieces, next ID: CHUM-{manifest.next_number:04d}", flush=True)
+    index = AssetIndex(**config["index"]) if config.get("index") else None
+    if index is not None and refresh:
+        index.max_age = 0
+
+    if regen:
+        feeder = None
+        jobs = regen_jobs(manifest, {key for key, _ in targets} or None)
+        total = len(jobs)
+    else:
+        collections = config["collections"]
+        print(f"Fetching {', '.join(key for key, _ in targets)}...", flush=True)
+        queues = {key: Candidates(key, collections[key], count, manifest, index) for key, count in targets}
+        jobs = feeder = Feeder(queues, dict(targets))
+        total = "?" if any(c is None for _, c in targets) else sum(c for _, c in targets)
+    cache = ImageCache(**config["image_cache"]) if config.get("image_cache") else None
+    render = {**config["render"], **{k: v for k, v in render_overrides.items() if v is not None}}
+    tmpdir = tempfile.mkdtemp(prefix="chum_pool_")
+
+    def fetch_one(job):
+        job.workdir = tempfile.mkdtemp(dir=tmpdir)
+        src = os.path.join(job.workdir, "source.png")
+        if not net.download(job.asset.image_urls, src, cache=cache):
+            raise RuntimeError("download failed (all gateways)")
+        if job.number is None:
+            job.number = manifest.claim_number()  # only once there is something to render, to keep IDs dense
+        job.input_hash = input_hash(src, render, job.piece_id)  # the piece ID is generate()'s default seed
+        if job.input_hash == manifest.input_hash(job.piece_id):
+            shutil.rmtree(job.workdir, ignore_errors=True)
+            raise Skip("unchanged")
+        return src, os.path.join(job.workdir, job.piece_id)
+
+    def upload_one(job, mp4_path, png_path):
+        piece = {
+            "id": job.piece_id,
+            "name": f"CHUM #{job.number:04d}",
+            "mp4": storage.upload(mp4_path),
+            "png": storage.upload(png_path),
+            "mp4_size": os.path.getsize(mp4_path),
+            "png_size": os.path.getsize(png_path),
+            "input_hash": job.input_hash,
+        }
+        shutil.rmtree(job.workdir, ignore_errors=True)
+        return piece
+
+    print(f"\nGenerating {'all new' if total == '?' else f'up to {total}'} pieces @ {render['num_frames']} frames / {render['fps']}fps\n", flush=True)
+    pipeline = Pipeline(fetch_one, upload_one, fetch_workers=workers.get("fetch", 8),
+                        render_workers=render_workers or workers.get("render"),
+                        upload_workers=workers.get("upload", 8), **render)
+    success = failed = skipped = 0
+    try:
+        for job, result in pipeline.run(jobs):
+            ok = isinstance(result, dict)
+            if feeder is not None:
+                feeder.finished(job, ok)
+            name = job.piece_id if job.number is not None else job.asset.source_id
+            if isinstance(result, Skip):
+                skipped += 1
+            elif ok:
+                manifest.add(result, {"collection": job.key, "source_id": job.asset.source_id,
+                                      "urls": job.asset.image_urls})
+                if index is not None:
+                    index.done(job.key, job.asset.source_id, job.piece_id)
+                success += 1
+                print(f"✓ [{success}/{total}] {name} (MP4:{result['mp4_size']//1024}KB, "
+                      f"PNG:{result['png_size']//1024}KB)", flush=True)
+            else:
+                failed += 1
+                if index is not None:
+                    index.failed(job.key, job.asset.source_id, result)
+                print(f"✗ {name}: {result}", flush=True)
+        for pending in feeder.queues.values() if feeder is not None else ():
+            pending.finish()
+    finally:
+        manifest.publish()
+        storage.close()
+        shutil.rmtree(tmpdir, ignore_errors=True)
+        if index is not None:
+            index.close()
+
+    print(f"\n{'='*60}", flush=True)
+    for key, count in targets if feeder is not None else ():
+        print(f"  {key}: {feeder.ok[key]}" + (f"/{count}" if count is not None else ""), flush=True)
+    print(f"DONE: {success} generated, {skipped} unchanged, {failed} failed", flush=True)
+    print(f"Uploads: {storage.summary()}", flush=True)
+    if cache is not None:
+        print(f"Image cache: {cache.summary()}", flush=True)
+    if net.GATEWAY_SCORES.cost:
+        print(f"Image hosts: {net.GATEWAY_SCORES.summary()}", flush=True)
+    print(f"Total pool: {len(manifest)}", flush=True)
+    print(f"{'='*60}", flush=True)
+    return success, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate art-pool pieces from configured collections")
+    parser.add_argument("collections", nargs="*", help="collection[:count] keys from the config")
+    parser.add_argument("--regen", action="store_true",
+                        help="Re-render existing pieces (of the given collections, default all) whose inputs changed")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Re-sweep the collections' APIs even if the local index is fresh")
+    parser.add_argument("--config", default=DEFAULT_CONFIG, help="Sources config (default: pool-sources.json)")
+    parser.add_argument("--workers", type=int, default=None, help="Render processes (default: CPU count)")
+    parser.add_argument("--frames", type=int, default=None, help="Frames per piece (default from config)")
+    parser.add_argument("--fps", type=int, default=None, help="Frames per second (default from config)")
+    parser.add_argument("--cols", type=int, default=None, help="ASCII columns (default from config)")
+    parser.add_argument("--size", type=int, default=None, help="Output size in px (default from config)")
+    parser.add_argument("--loop", type=int, default=None,
+                        help="Render one seamless cycle of this many frames and repeat it (default from config)")
+    args = parser.parse_args(argv)
+    if not args.collections and not args.regen:
+        parser.error("name at least one collection (or use --regen)")
+
+    config = load_config(args.config)
+    targets = parse_targets(args.collections, config["collections"])
+    run(targets, config, render_workers=args.workers, regen=args.regen, refresh=args.refresh,
+        num_frames=args.frames, fps=args.fps, cols=args.cols, target_size=args.size, loop=args.loop)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,40 @@
+"""Config file and credentials."""
+import os, json
+
+from .cache import DEFAULT_ROOT as DEFAULT_CACHE_DIR
+from .engine import SCRIPTS_DIR
+
+DEFAULT_CONFIG = os.path.join(SCRIPTS_DIR, "pool-sources.json")
+BACKEND_ENV = os.path.join(SCRIPTS_DIR, "..", "..", "backend", ".env")
+ENV_KEYS = ("HELIUS_API_KEY", "ALCHEMY_API_KEY", "SUPABASE_URL", "SUPABASE_SERVICE_KEY")
+
+
+def load_env(path=BACKEND_ENV):
+    """Fill missing ENV_KEYS in os.environ from backend/.env (the run-*.sh convention)."""
+    if not os.path.exists(path):
+        return
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#") and "=" in line:
+                k, v = line.split("=", 1)
+                if k.strip() in ENV_KEYS:
+                    os.environ.setdefault(k.strip(), v.strip())
+
+
+def load_config(path=DEFAULT_CONFIG):
+    """Parse the config; relative paths in it resolve against its directory."""
+    with open(path) as f:
+        config = json.load(f)
+    base = os.path.dirname(os.path.abspath(path))
+    config["manifest"] = os.path.join(base, config.get("manifest", "pool-manifest.json"))
+    cache = config.get("image_cache")
+    if cache:
+        config["image_cache"] = {"root": os.path.join(base, os.path.expanduser(cache.get("dir", DEFAULT_CACHE_DIR))),
+                                 "max_bytes": int(cache.get("max_mb", 2048)) << 20}
+    index = config.get("index")
+    if index:
+        config["index"] = {"path": os.path.join(base, index.get("path", "pool-index.sqlite")),
+                           "max_age": float(index.get("max_age_hours", 24)) * 3600,
+                           "max_attempts": int(index.get("max_attempts", 3))}
+    return config
@@ -0,0 +1,86 @@
+"""Process-pool render engine shared by the pool generators.
+
+Rendering is CPU-bound Pillow/NumPy work, so threads around it serialize on
+the GIL. RenderPool runs ascii-nft-gen in a ProcessPoolExecutor sized to the
+cores; each worker imports the generator once at startup. Downloads and
+uploads stay on threads (see pipeline.py) so network waits overlap the renders.
+"""
+import os, io, json, hashlib, importlib.util, contextlib, multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_gen = None  # ascii-nft-gen module, loaded once per worker process
+
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+# Any edit to the generator changes its output, so its source hash is the version
+GENERATOR_VERSION = file_sha256(os.path.join(SCRIPTS_DIR, "ascii-nft-gen.py"))[:16]
+
+
+def input_hash(image_path, render_kwargs, seed):
+    """Content hash of everything a render depends on: source bytes, generator version, settings, seed."""
+    key = {"image": file_sha256(image_path), "generator": GENERATOR_VERSION, "render": render_kwargs, "seed": seed}
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+
+
+def load_ascii_gen():
+    spec = importlib.util.spec_from_file_location("ascii_nft_gen", os.path.join(SCRIPTS_DIR, "ascii-nft-gen.py"))
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+def _init_worker():
+    global _gen
+    _gen = load_ascii_gen()
+
+
+def _render(image_path, output_base, kwargs, verbose):
+    if verbose:
+        return _gen.generate(image_path, output_base, **kwargs)
+    # Per-frame progress from N workers at once is just noise
+    with contextlib.redirect_stdout(io.StringIO()):
+        return _gen.generate(image_path, output_base, **kwargs)
+
+
+class RenderPool:
+    """ProcessPoolExecutor running ascii-nft-gen generate(); one render per core.
+
+    Workers are spawned (not forked) so they never inherit locks held by the
+    parent's download/upload threads or ffmpeg stderr readers.
+    render_kwargs (cols, num_frames, fps, target_size, engine, ...) are passed
+    to every generate() call; submit() can override them per piece.
+    """
+
+    def __init__(self, workers=None, verbose=False, **render_kwargs):
+        self.workers = workers or os.cpu_count() or 1
+        self.verbose = verbose
+        self.render_kwargs = render_kwargs
+        self.executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"),
+                                            initializer=_init_worker)
+
+    def submit(self, image_path, output_base, **overrides):
+        """Future resolving to generate()'s (mp4_path, png_path)."""
+        kwargs = dict(self.render_kwargs, **overrides)
+        return self.executor.submit(_render, image_path, output_base, kwargs, self.verbose)
+
+    def render(self, image_path, output_base, **overrides):
+        return self.submit(image_path, output_base, **overrides).result()
+
+    def close(self, cancel=False):
+        self.executor.shutdown(wait=True, cancel_futures=cancel)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(cancel=exc_type is not None)
+
@@ -0,0 +1,88 @@
+"""asyncio plumbing for the metadata sources.
+
+Page requests run concurrently on a private event loop (the blocking
+urllib calls go to worker threads), paced by a TokenBucket instead of
+fixed sleeps. stream() bridges an async generator back to ordinary
+iteration so callers can start on the first items while later pages are
+still loading.
+"""
+import time, queue, asyncio, threading
+
+from . import net
+
+_END = object()
+
+
+class TokenBucket:
+    """Allow rate requests per second on average, in bursts of up to burst."""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate)
+        self.tokens = self.capacity
+        self.stamp = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.stamp) * self.rate)
+                self.stamp = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+async def get_json(bucket, url, payload=None, **kwargs):
+    """net.get_json() on a worker thread once bucket allows another request."""
+    await bucket.acquire()
+    return await asyncio.to_thread(net.get_json, url, payload, **kwargs)
+
+
+def stream(agen, buffer=5000):
+    """Iterate async generator agen on a background event loop; returns a plain iterator.
+
+    The loop starts immediately and runs up to buffer items ahead of the
+    consumer. Abandoning the iterator stops the loop; exceptions raised by
+    agen are re-raised in the consumer.
+    """
+    items = queue.Queue(buffer)
+    stop = threading.Event()
+
+    async def put(item):
+        while not stop.is_set():
+            try:
+                items.put_nowait(item)
+                return
+            except queue.Full:
+                await asyncio.sleep(0.05)
+
+    async def drain():
+        try:
+            async for item in agen:
+                await put(item)
+                if stop.is_set():
+                    break
+        except Exception as e:
+            await put(e)
+        finally:
+            await agen.aclose()
+            await put(_END)
+
+    threading.Thread(target=asyncio.run, args=(drain(),), daemon=True).start()
+
+    def consume():
+        try:
+            while True:
+                item = items.get()
+                if item is _END:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+
+    return consume()
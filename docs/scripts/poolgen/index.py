@@ -0,0 +1,113 @@
+"""Local SQLite index of source assets, so picking candidates is a query, not an API sweep.
+
+One row per (collection, source_id) with its image URLs, when a sweep
+last saw it, and what happened to it: new, done (in the pool as
+piece_id) or failed (attempts, last error). A collection swept within
+max_age is served from the index alone; otherwise assets are recorded
+as the source streams them and the sweep is finished at the end of the
+run, so the next run can skip it.
+"""
+import json, time, sqlite3, threading
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS assets (
+    collection TEXT NOT NULL,
+    source_id  TEXT NOT NULL,
+    urls       TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen  REAL NOT NULL,
+    status     TEXT NOT NULL DEFAULT 'new',
+    piece_id   TEXT,
+    attempts   INTEGER NOT NULL DEFAULT 0,
+    error      TEXT,
+    PRIMARY KEY (collection, source_id)
+);
+CREATE INDEX IF NOT EXISTS assets_status ON assets (collection, status, attempts);
+CREATE TABLE IF NOT EXISTS sweeps (
+    collection TEXT PRIMARY KEY,
+    finished   REAL NOT NULL,
+    assets     INTEGER NOT NULL
+);
+"""
+
+
+class AssetIndex:
+    """Thread-safe wrapper around one SQLite file (the Feeder and the result loop share it)."""
+
+    def __init__(self, path, max_age=24 * 3600, max_attempts=3, batch=500):
+        self.max_age = max_age
+        self.max_attempts = max_attempts
+        self.batch = batch
+        self.lock = threading.Lock()
+        self.pending = []
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+
+    def fresh(self, collection):
+        with self.lock:
+            row = self.db.execute("SELECT finished FROM sweeps WHERE collection = ?", (collection,)).fetchone()
+        return row is not None and time.time() - row[0] < self.max_age
+
+    def _write_pending(self):
+        """Store the assets record() has passed on so far; call with the lock held."""
+        rows, self.pending = self.pending, []
+        with self.db:
+            self.db.executemany(
+                "INSERT INTO assets (collection, source_id, urls, first_seen, last_seen) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (collection, source_id) DO UPDATE SET urls = excluded.urls, last_seen = excluded.last_seen",
+                [(collection, a.source_id, json.dumps(a.image_urls), now, now) for collection, a, now in rows])
+
+    def record(self, collection, source):
+        """Pass source's stream through, storing each asset; sets the sweep time once it is exhausted.
+
+        Assets are written in batches, and before any done()/failed() so
+        those always find their row. A source that stopped on a failed
+        request (source.truncated) gets no sweep time, so the next run lists
+        it again instead of trusting a partial index.
+        """
+        now, n = time.time(), 0
+        for asset in source.stream():
+            with self.lock:
+                self.pending.append((collection, asset, now))
+                if len(self.pending) >= self.batch:
+                    self._write_pending()
+            n += 1
+            yield asset
+        with self.lock:
+            self._write_pending()
+            if source.truncated:
+                print(f"  {collection}: listing cut short, sweep not recorded", flush=True)
+                return
+            with self.db:
+                self.db.execute("INSERT OR REPLACE INTO sweeps VALUES (?, ?, ?)", (collection, now, n))
+
+    def candidates(self, collection, asset_type):
+        """Assets not in the pool yet: never tried first, then failures with attempts left."""
+        with self.lock:
+            rows = self.db.execute(
+                "SELECT source_id, urls FROM assets WHERE collection = ? AND status != 'done' AND attempts < ? "
+                "ORDER BY attempts, random()", (collection, self.max_attempts)).fetchall()
+        return (asset_type(source_id, json.loads(urls)) for source_id, urls in rows)
+
+    def done(self, collection, source_id, piece_id):
+        with self.lock, self.db:
+            self._write_pending()
+            self.db.execute("UPDATE assets SET status = 'done', piece_id = ?, error = NULL "
+                            "WHERE collection = ? AND source_id = ?", (piece_id, collection, source_id))
+
+    def failed(self, collection, source_id, error):
+        with self.lock, self.db:
+            self._write_pending()
+            self.db.execute("UPDATE assets SET status = 'failed', attempts = attempts + 1, error = ? "
+                            "WHERE collection = ? AND source_id = ?", (str(error)[:500], collection, source_id))
+
+    def summary(self, collection):
+        with self.lock:
+            counts = dict(self.db.execute("SELECT status, COUNT(*) FROM assets WHERE collection = ? GROUP BY status",
+                                          (collection,)).fetchall())
+        return ", ".join(f"{counts.get(s, 0)} {s}" for s in ("new", "done", "failed"))
+
+    def close(self):
+        with self.lock:
+            self.db.close()
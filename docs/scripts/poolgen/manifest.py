@@ -0,0 +1,193 @@
+"""pool-manifest.json: the local working copy and the public copy in the bucket.
+
+The local file keeps source_ids (dedup keys) and sources (piece ID →
+collection, source ID and image URLs, for regeneration) next to the
+pieces; the copy published to the bucket (what the backend's
+getPoolManifest reads) carries only the pieces, so no source collection
+references leave this machine. Each piece records input_hash, the content
+hash of everything its render depended on. Alongside it go a minified
+compact manifest and fixed-size shards with an index (see publish()).
+Each add() appends one line to a JSONL journal next to the file and
+fsyncs it, so recording a piece costs O(1) and survives a crash. Every
+compact_every additions (and on publish) the journal is folded into the
+manifest, which is rewritten atomically, and then emptied. Replaying
+is idempotent (pieces replace by id), so dying between the two steps
+loses nothing; a torn last journal line is ignored.
+"""
+import os, json, threading
+
+NAME = "pool-manifest.json"
+COMPACT_NAME = "pool-manifest.min.json"
+INDEX_NAME = "pool-manifest.index.json"
+SHARD_NAME = "pool-manifest.shard-{:04d}.json"
+LOCAL_KEYS = ("source_ids", "sources")
+
+
+def piece_key(piece):
+    """A piece's id; entries written by fast-pool-gen.py / batch-pool-gen.py call it piece_id."""
+    return piece.get("id") or piece.get("piece_id")
+
+
+def piece_urls(piece):
+    """(mp4, png) URLs of a piece; legacy entries store them as mp4_url / png_url."""
+    return piece.get("mp4") or piece.get("mp4_url"), piece.get("png") or piece.get("png_url")
+
+
+def compact(pieces, base):
+    """Minimal consumer view of pieces: {"base", "ids", "urls"}.
+
+    A piece whose files are base + id + ".mp4"/".png" (every piece
+    pool-gen uploads) is just its id; only the others carry their URLs,
+    in urls[id] = {"mp4", "png"}. Pieces with no id at all are left out.
+    """
+    ids, urls = [], {}
+    for p in pieces:
+        pid = piece_key(p)
+        if not pid:
+            continue
+        ids.append(pid)
+        mp4, png = piece_urls(p)
+        if mp4 != f"{base}{pid}.mp4" or png != f"{base}{pid}.png":
+            urls[pid] = {"mp4": mp4, "png": png}
+    return {"base": base, "ids": ids, "urls": urls}
+
+
+def dumps(obj):
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+class Manifest:
+    def __init__(self, path, storage=None, compact_every=200, shard_size=500):
+        self.path = path
+        self.shard_size = shard_size
+        self.journal_path = path + ".journal"
+        self.storage = storage
+        self.compact_every = compact_every
+        self.lock = threading.Lock()
+        self.journal = None
+        self.dirty = 0
+        if os.path.exists(path):
+            with open(path) as f:
+                self.data = json.load(f)
+        elif storage is not None:
+            self.data = storage.get_json(NAME)
+        else:
+            self.data = {"total": 0, "pieces": []}
+        self.data.setdefault("pieces", [])
+        self.data.setdefault("source_ids", [])
+        self.data.setdefault("sources", {})
+        self.source_ids = set(self.data["source_ids"])
+        self.index = {p.get("id"): i for i, p in enumerate(self.data["pieces"])}
+        if self._replay():
+            self.save()  # fold it in now, so new entries never follow a torn line
+        numbers = [int(p["id"].removeprefix("CHUM-")) for p in self.data["pieces"]
+                   if p.get("id", "").removeprefix("CHUM-").isdigit()]
+        self.next_number = max(numbers, default=0) + 1
+
+    def _replay(self):
+        """Apply the journal left by an interrupted run; returns whether there was one."""
+        if not os.path.exists(self.journal_path):
+            return False
+        with open(self.journal_path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:  # torn write at a crash
+                    break
+                self._apply(entry["piece"], entry.get("source"))
+        return True
+
+    def _apply(self, piece, source):
+        i = self.index.get(piece["id"])
+        if i is None:
+            self.index[piece["id"]] = len(self.data["pieces"])
+            self.data["pieces"].append(piece)
+        else:
+            self.data["pieces"][i] = piece
+        if source is not None:
+            self.data["sources"][piece["id"]] = source
+            if source["source_id"] not in self.source_ids:
+                self.source_ids.add(source["source_id"])
+                self.data["source_ids"].append(source["source_id"])
+
+    def __len__(self):
+        return len(self.data["pieces"])
+
+    def has(self, source_id):
+        return source_id in self.source_ids
+
+    def input_hash(self, piece_id):
+        i = self.index.get(piece_id)
+        return None if i is None else self.data["pieces"][i].get("input_hash")
+
+    def sources(self):
+        """{piece_id: {"collection", "source_id", "urls"}} for pieces that can be regenerated."""
+        return self.data["sources"]
+
+    def claim_number(self):
+        """Next free CHUM-NNNN number (thread-safe)."""
+        with self.lock:
+            n = self.next_number
+            self.next_number += 1
+            return n
+
+    def add(self, piece, source=None):
+        """Add or (same id) replace a piece. source: {"collection", "source_id", "urls"}."""
+        with self.lock:
+            if self.journal is None:
+                self.journal = open(self.journal_path, "a")
+            self.journal.write(json.dumps({"piece": piece, "source": source}) + "\n")
+            self.journal.flush()
+            os.fsync(self.journal.fileno())
+            self._apply(piece, source)
+            self.dirty += 1
+            compact = self.dirty >= self.compact_every
+        if compact:
+            self.save()
+
+    def save(self):
+        """Compact: rewrite the manifest atomically with everything journaled, then empty the journal."""
+        with self.lock:
+            self.data["total"] = len(self.data["pieces"])
+            if "generated" in self.data:
+                self.data["generated"] = self.data["total"]
+            tmp = self.path + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(self.data, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+            if self.journal is not None:
+                self.journal.close()
+                self.journal = None
+            if os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+            self.dirty = 0
+
+    def public(self):
+        return {k: v for k, v in self.data.items() if k not in LOCAL_KEYS}
+
+    def publish(self):
+        """Save locally and upload the public copy to the bucket, plus the compact forms.
+
+        pool-manifest.min.json holds compact() of every piece; the same is
+        split into pool-manifest.shard-NNNN.json files of shard_size pieces,
+        listed with their counts in pool-manifest.index.json, so a consumer
+        can pick a shard by weight and fetch only that.
+        """
+        self.save()
+        if self.storage is None:
+            return
+        self.storage.put_json(NAME, self.public())
+        base = self.storage.public_url("")
+        pieces = [p for p in self.data["pieces"] if piece_key(p)]
+        self.storage.put(COMPACT_NAME, dumps(compact(pieces, base)), "application/json")
+        shards = []
+        for n, i in enumerate(range(0, len(pieces), self.shard_size)):
+            chunk = pieces[i:i + self.shard_size]
+            name = SHARD_NAME.format(n)
+            self.storage.put(name, dumps(compact(chunk, base)), "application/json")
+            shards.append({"name": name, "count": len(chunk), "first": piece_key(chunk[0]),
+                           "last": piece_key(chunk[-1])})
+        self.storage.put(INDEX_NAME, dumps({"base": base, "total": len(pieces), "shard_size": self.shard_size,
+                                            "shards": shards}), "application/json")
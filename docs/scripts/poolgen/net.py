@@ -0,0 +1,238 @@
+"""HTTP helpers shared by the sources, downloader and storage client."""
+import io, re, ssl, json, time, shutil, queue, threading, http.client, urllib.parse, urllib.request, urllib.error
+
+from PIL import Image
+
+USER_AGENT = "Mozilla/5.0"
+
+IPFS_GATEWAYS = [
+    "https://nft-cdn.alchemy.com/eth-mainnet/",
+    "https://cloudflare-ipfs.com/ipfs/",
+    "https://ipfs.io/ipfs/",
+    "https://dweb.link/ipfs/",
+    "https://gateway.pinata.cloud/ipfs/",
+]
+
+CID_RE = re.compile(r'(Qm[a-zA-Z0-9]{44,}|bafkrei[a-z0-9]+|bafybei[a-z0-9]+)')
+
+
+def request(url, data=None, headers=None, method=None, timeout=30):
+    """urlopen() with our User-Agent; returns the response body."""
+    req = urllib.request.Request(url, data=data, method=method, headers={"User-Agent": USER_AGENT, **(headers or {})})
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        return resp.read()
+
+
+def get_json(url, payload=None, retries=3, backoff=2, timeout=60, label="request"):
+    """GET (or POST payload as JSON) and decode, retrying with linear backoff.
+
+    Returns None once retries are exhausted.
+    """
+    data = json.dumps(payload).encode() if payload is not None else None
+    headers = {"Content-Type": "application/json", "Accept": "application/json"}
+    for attempt in range(retries):
+        try:
+            return json.loads(request(url, data, headers, timeout=timeout))
+        except Exception as e:
+            print(f"  {label} retry {attempt+1}/{retries}: {e}", flush=True)
+            time.sleep(backoff * (attempt + 1))
+    return None
+
+
+def image_candidates(url):
+    """url plus the same CID on every IPFS gateway (ipfs:// URLs are rewritten)."""
+    if url.startswith("ipfs://"):
+        url = "https://ipfs.io/ipfs/" + url[7:].removeprefix("ipfs/")
+    urls = [url]
+    m = CID_RE.search(url)
+    if m:
+        urls += [gw + m.group(1) for gw in IPFS_GATEWAYS if gw + m.group(1) != url]
+    return urls
+
+
+def is_image(data):
+    """True if data parses as an image header Pillow can render (not an HTML error page)."""
+    try:
+        with Image.open(io.BytesIO(data)) as im:
+            return im.width > 0 and im.height > 0
+    except Exception:
+        return False
+
+
+class GatewayScores:
+    """Per-host download record used to try the historically fastest gateways first.
+
+    cost is an exponential moving average of seconds per attempt, where a
+    failure counts as the full timeout and a cancelled loser as the time it
+    had taken so far. Hosts never tried score 0 so they get explored.
+    """
+    ALPHA = 0.3
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.cost = {}
+        self.ok = {}
+        self.failed = {}
+
+    def record(self, url, seconds, ok):
+        host = urllib.parse.urlsplit(url).netloc
+        with self.lock:
+            prev = self.cost.get(host, seconds)
+            self.cost[host] = prev + self.ALPHA * (seconds - prev)
+            if ok is not None:
+                counts = self.ok if ok else self.failed
+                counts[host] = counts.get(host, 0) + 1
+
+    def rank(self, urls):
+        with self.lock:
+            return sorted(urls, key=lambda u: self.cost.get(urllib.parse.urlsplit(u).netloc, 0.0))
+
+    def summary(self):
+        with self.lock:
+            return ", ".join(f"{h} {self.cost[h]:.1f}s ({self.ok.get(h, 0)}✓ {self.failed.get(h, 0)}✗)"
+                             for h in sorted(self.cost, key=self.cost.get))
+
+
+GATEWAY_SCORES = GatewayScores()
+
+
+def _fetch(url, timeout, stop):
+    """GET url in chunks, giving up as soon as stop is set; returns bytes or None."""
+    req = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+    chunks = []
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        while not stop.is_set():
+            chunk = resp.read(64 * 1024)
+            if not chunk:
+                return b"".join(chunks)
+            chunks.append(chunk)
+    return None
+
+
+def download(urls, dest, max_tries=8, timeout=20, cache=None, race=3, scores=GATEWAY_SCORES):
+    """Fetch the first URL (or IPFS gateway alternative) that returns a valid image.
+
+    Up to race candidates are in flight at once, best-scored gateways first;
+    each failure starts the next candidate. The first body that decodes as
+    an image wins and the losers stop reading at their next chunk.
+    cache: an ImageCache consulted before any network call and filled on success.
+    Returns True on success, False if every candidate failed.
+    """
+    if cache is not None:
+        blob = cache.get(urls)
+        if blob is not None:
+            try:
+                shutil.copyfile(blob, dest)
+                return True
+            except OSError:  # evicted by another fetch thread since get(); download it again
+                pass
+    candidates = []
+    for url in urls:
+        candidates += [u for u in image_candidates(url) if u not in candidates]
+    pending = scores.rank(candidates)[:max_tries]
+    results = queue.Queue()
+    stop = threading.Event()
+
+    def attempt(url):
+        t0 = time.time()
+        try:
+            data = _fetch(url, timeout, stop)
+        except Exception:
+            data = b""
+        if data is None:  # cancelled: another candidate already won
+            scores.record(url, time.time() - t0, None)
+            return
+        ok = is_image(data)
+        scores.record(url, time.time() - t0 if ok else timeout, ok)
+        results.put((url, data if ok else None))
+
+    def launch():
+        threading.Thread(target=attempt, args=(pending.pop(0),), daemon=True).start()
+
+    inflight = 0
+    while pending and inflight < race:
+        launch()
+        inflight += 1
+    while inflight:
+        url, data = results.get()
+        inflight -= 1
+        if data is not None:
+            stop.set()
+            with open(dest, "wb") as f:
+                f.write(data)
+            if cache is not None:
+                cache.put(list(urls) + [url], data)
+            return True
+        if pending:
+            launch()
+            inflight += 1
+    return False
+
+
+class ConnectionPool:
+    """Keep-alive http.client connections to one host, shared across threads.
+
+    At most size requests are in flight; finished connections go back on a
+    LIFO stack so the warmest (least likely to have been closed by the
+    server) is reused first. A request that fails because the server dropped
+    an idle connection is retried once on a fresh one.
+
+    body may be bytes or a seekable binary file: files are streamed in
+    BLOCKSIZE chunks (pass Content-Length) and rewound for the retry, so a
+    large upload never has to sit in memory.
+    """
+    BLOCKSIZE = 64 * 1024
+    STALE = (http.client.RemoteDisconnected, http.client.CannotSendRequest, ConnectionResetError, BrokenPipeError)
+
+    def __init__(self, base_url, size=8, timeout=60):
+        parts = urllib.parse.urlsplit(base_url)
+        self.https = parts.scheme == "https"
+        self.host = parts.netloc
+        self.timeout = timeout
+        self.slots = threading.BoundedSemaphore(size)
+        self.idle = queue.LifoQueue()
+        self.context = ssl.create_default_context() if self.https else None
+
+    def _connect(self):
+        if self.https:
+            return http.client.HTTPSConnection(self.host, timeout=self.timeout, context=self.context,
+                                               blocksize=self.BLOCKSIZE)
+        return http.client.HTTPConnection(self.host, timeout=self.timeout, blocksize=self.BLOCKSIZE)
+
+    def request(self, method, path, body=None, headers=None):
+        """Send one request; returns (status, headers, body bytes)."""
+        headers = {"User-Agent": USER_AGENT, **(headers or {})}
+        start = body.tell() if hasattr(body, "seek") else None
+        with self.slots:
+            try:
+                conn, fresh = self.idle.get_nowait(), False
+            except queue.Empty:
+                conn, fresh = self._connect(), True
+            while True:
+                if start is not None:
+                    body.seek(start)
+                try:
+                    conn.request(method, path, body=body, headers=headers)
+                    resp = conn.getresponse()
+                    data = resp.read()
+                except self.STALE:
+                    conn.close()
+                    if fresh:
+                        raise
+                    conn, fresh = self._connect(), True
+                    continue
+                except BaseException:
+                    conn.close()
+                    raise
+                if resp.will_close:
+                    conn.close()
+                else:
+                    self.idle.put(conn)
+                return resp.status, resp.headers, data
+
+    def close(self):
+        while True:
+            try:
+                self.idle.get_nowait().close()
+            except queue.Empty:
+                return
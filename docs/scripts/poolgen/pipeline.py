@@ -0,0 +1,160 @@
+"""Three-stage fetch → render → upload pipeline with bounded queues.
+
+Each stage has its own worker pool: I/O threads for fetch and upload, the
+process-pool RenderPool for render. Stages are joined by bounded queues, so a
+slow stage back-pressures the ones before it and at most
+queue_size + workers items are held per stage.
+
+    fetch(item)                      -> (image_path, output_base), or None to skip
+    render                           -> RenderPool.render(image_path, output_base)
+    upload(item, mp4_path, png_path) -> result yielded by Pipeline.run()
+
+An exception (or None) from any stage ends that item: it is yielded as the
+result and skips the later stages. Raise Skip for items that need no work
+(e.g. unchanged inputs) so they are not counted as failures. An exception
+from the items iterator itself stops feeding; run() yields what was already
+fed and then re-raises it. Stage throughput, utilization and queue depths
+are printed every report_every seconds and once at the end.
+"""
+import time, queue, threading
+
+from .engine import RenderPool
+
+_DONE = object()
+
+
+class Skip(Exception):
+    """Raised by a stage function to drop an item that needs no further work."""
+
+
+class Stage:
+    """A pool of threads applying fn to (item, payload) pairs from inbox."""
+
+    def __init__(self, name, fn, workers, inbox, outbox, results):
+        self.name = name
+        self.fn = fn
+        self.workers = workers
+        self.inbox = inbox
+        self.outbox = outbox
+        self.results = results
+        self.done = 0
+        self.failed = 0
+        self.skipped = 0
+        self.busy = 0.0
+        self.lock = threading.Lock()
+        self.live = workers
+        self.threads = [threading.Thread(target=self._work, name=f"{name}-{i}", daemon=True)
+                        for i in range(workers)]
+
+    def start(self):
+        for t in self.threads:
+            t.start()
+
+    def _work(self):
+        while True:
+            job = self.inbox.get()
+            if job is _DONE:
+                self.inbox.put(_DONE)  # wake the sibling workers too
+                break
+            item, payload = job
+            t = time.monotonic()
+            try:
+                out = self.fn(item, payload)
+            except Exception as e:
+                out = e
+            with self.lock:
+                self.busy += time.monotonic() - t
+                if isinstance(out, Skip):
+                    self.skipped += 1
+                elif out is None or isinstance(out, Exception):
+                    self.failed += 1
+                else:
+                    self.done += 1
+            if out is None or isinstance(out, Exception) or self.outbox is None:
+                self.results.put((item, out))
+            else:
+                self.outbox.put((item, out))
+        with self.lock:
+            self.live -= 1
+            last = self.live == 0
+        if last and self.outbox is not None:
+            self.outbox.put(_DONE)
+
+    def stats(self, elapsed):
+        rate = self.done / elapsed if elapsed else 0.0
+        util = self.busy / (elapsed * self.workers) if elapsed else 0.0
+        depth = f"{self.inbox.qsize()}/{self.inbox.maxsize}" if self.inbox.maxsize else str(self.inbox.qsize())
+        skipped = f" {self.skipped}⤼" if self.skipped else ""
+        return f"{self.name} {self.done}✓ {self.failed}✗{skipped} {rate:.2f}/s busy {util:.0%} q {depth}"
+
+
+class Pipeline:
+    """fetch → render → upload over bounded queues; run(items) yields (item, result).
+
+    fetch_workers / upload_workers are thread counts, render_workers the
+    process count (default: one per core). queue_size bounds each inter-stage
+    queue (default: 2x the consuming stage's workers). render_kwargs go to
+    RenderPool.
+    """
+
+    def __init__(self, fetch, upload, fetch_workers=8, render_workers=None, upload_workers=8,
+                 queue_size=None, report_every=30.0, **render_kwargs):
+        self.fetch = fetch
+        self.upload = upload
+        self.fetch_workers = fetch_workers
+        self.render_workers = render_workers
+        self.upload_workers = upload_workers
+        self.queue_size = queue_size
+        self.report_every = report_every
+        self.render_kwargs = render_kwargs
+
+    def run(self, items):
+        with RenderPool(self.render_workers, **self.render_kwargs) as pool:
+            fetch_q, render_q, upload_q = (queue.Queue(self.queue_size or 2 * n)
+                                           for n in (self.fetch_workers, pool.workers, self.upload_workers))
+            results = queue.Queue()
+            stages = [
+                Stage("fetch", lambda item, _: self.fetch(item), self.fetch_workers, fetch_q, render_q, results),
+                Stage("render", lambda item, paths: pool.render(*paths), pool.workers, render_q, upload_q, results),
+                Stage("upload", lambda item, paths: self.upload(item, *paths), self.upload_workers, upload_q, None,
+                      results),
+            ]
+            for stage in stages:
+                stage.start()
+
+            fed = [0]
+            error = [None]
+
+            def feed():
+                try:
+                    for item in items:
+                        fetch_q.put((item, None))
+                        fed[0] += 1
+                except Exception as e:  # re-raised from run() once the fed items are through
+                    error[0] = e
+                finally:
+                    fetch_q.put(_DONE)
+
+            feeder = threading.Thread(target=feed, name="feed", daemon=True)
+            feeder.start()
+
+            start = last_report = time.monotonic()
+            finished = 0
+            while feeder.is_alive() or finished < fed[0]:
+                try:
+                    item, result = results.get(timeout=1.0)
+                except queue.Empty:
+                    pass
+                else:
+                    finished += 1
+                    yield item, result
+                now = time.monotonic()
+                if now - last_report >= self.report_every:
+                    self.report(stages, now - start)
+                    last_report = now
+            self.report(stages, time.monotonic() - start)
+            if error[0] is not None:
+                raise error[0]
+
+    def report(self, stages, elapsed):
+        print(f"  [pipeline {elapsed:.0f}s] " + " | ".join(s.stats(elapsed) for s in stages), flush=True)
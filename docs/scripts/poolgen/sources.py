@@ -0,0 +1,228 @@
+"""Source adapters: where a collection's images come from.
+
+Every adapter is built from a collection entry in the config file and
+returns Assets from fetch(limit), or streams them page by page from
+stream(limit). source_id is the dedup key kept in the manifest's
+source_ids: the mint address for Solana assets, "<collection>-<tokenId>"
+for everything else.
+"""
+import os, json, random, asyncio
+from collections import namedtuple
+
+from . import net, fetcher
+
+Asset = namedtuple("Asset", "source_id image_urls")
+
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".gif", ".webp")
+
+
+class Source:
+    """Base adapter. pages() is an async generator of Asset lists, one per API page.
+
+    rate caps API requests per second (token bucket) for the whole fetch.
+    api is False for sources that list assets without any requests, which
+    callers then need not cap. truncated is set once a request fails for
+    good and the listing ends early.
+    """
+    rate = 5.0
+    api = True
+    truncated = False
+
+    async def pages(self):
+        raise NotImplementedError
+        yield
+
+    async def assets(self, limit=None):
+        n = 0
+        async for page in self.pages():
+            page = page[:None if limit is None else limit - n]
+            n += len(page)
+            print(f"  {self.key}: {n}", flush=True)
+            for asset in page:
+                yield asset
+            if limit is not None and n >= limit:
+                return
+
+    def stream(self, limit=None):
+        """Assets as they arrive; later pages keep loading while the caller works."""
+        return fetcher.stream(self.assets(limit))
+
+    def fetch(self, limit=None):
+        return list(self.stream(limit))
+
+
+class HeliusSource(Source):
+    """Solana assets via the Helius DAS API (getAssetsByGroup / searchAssets).
+
+    Pages are numbered, so concurrency pages are requested at once and
+    yielded in order; the first short page ends the fetch.
+    """
+    method = None
+    page_size = 1000
+
+    def __init__(self, key, address, retries=3, rate=10.0, concurrency=4, **_):
+        self.key = key
+        self.address = address
+        self.retries = retries
+        self.rate = rate
+        self.concurrency = concurrency
+
+    def params(self, page):
+        raise NotImplementedError
+
+    def parse(self, items):
+        return [Asset(item["id"], [img]) for item in items for img in [das_image(item)] if img]
+
+    async def page(self, bucket, url, n):
+        data = await fetcher.get_json(bucket, url, {"jsonrpc": "2.0", "id": self.key, "method": self.method,
+                                                    "params": self.params(n)}, retries=self.retries, label="Helius")
+        if data is None:
+            return None, []
+        items = (data or {}).get("result", {}).get("items", [])
+        return len(items), await asyncio.to_thread(self.parse, items)  # das_image may fetch json_uri
+
+    async def pages(self):
+        url = f"https://mainnet.helius-rpc.com/?api-key={os.environ.get('HELIUS_API_KEY', '')}"
+        bucket = fetcher.TokenBucket(self.rate)
+        tasks = {}
+        n = 1
+        try:
+            while True:
+                for ahead in range(n, n + self.concurrency):
+                    if ahead not in tasks:
+                        tasks[ahead] = asyncio.create_task(self.page(bucket, url, ahead))
+                count, assets = await tasks.pop(n)
+                if count is None:
+                    self.truncated = True
+                    return
+                yield assets
+                if count < self.page_size:
+                    return
+                n += 1
+        finally:
+            for task in tasks.values():
+                task.cancel()
+
+
+class HeliusCollection(HeliusSource):
+    method = "getAssetsByGroup"
+
+    def params(self, page):
+        return {"groupKey": "collection", "groupValue": self.address, "page": page, "limit": self.page_size}
+
+
+class HeliusCreator(HeliusSource):
+    """For drops with no on-chain collection (e.g. BOOGLEs)."""
+    method = "searchAssets"
+
+    def params(self, page):
+        return {"creatorAddress": self.address, "page": page, "limit": self.page_size}
+
+
+def das_image(item):
+    """Image URL of a DAS asset: links.image, an image file, metadata.image, then json_uri."""
+    content = item.get("content", {})
+    if content.get("links", {}).get("image"):
+        return content["links"]["image"]
+    for f in content.get("files", []):
+        uri = f.get("uri", "")
+        if f.get("mime", "").startswith("image/") or uri.lower().endswith(IMAGE_EXTS):
+            return uri
+    if content.get("metadata", {}).get("image"):
+        return content["metadata"]["image"]
+    if content.get("json_uri"):
+        try:
+            return json.loads(net.request(content["json_uri"], timeout=15)).get("image", "")
+        except:
+            pass
+    return ""
+
+
+class AlchemyContract(Source):
+    """Ethereum NFTs via Alchemy getNFTsForContract.
+
+    Pages chain through pageKey, so the next page is requested as soon as
+    its key arrives, before the current one is handed on. The default rate
+    is gentle because Alchemy 500s under load.
+    """
+
+    def __init__(self, key, contract, page_size=100, rate=3.0, retries=3, **_):
+        self.key = key
+        self.contract = contract
+        self.page_size = page_size
+        self.rate = rate
+        self.retries = retries
+
+    async def pages(self):
+        base = f"https://eth-mainnet.g.alchemy.com/nft/v3/{os.environ.get('ALCHEMY_API_KEY', 'demo')}"
+        bucket = fetcher.TokenBucket(self.rate)
+
+        def request(start_token):
+            url = (f"{base}/getNFTsForContract?contractAddress={self.contract}"
+                   f"&withMetadata=true&limit={self.page_size}")
+            if start_token:
+                url += f"&startToken={start_token}"
+            return asyncio.create_task(fetcher.get_json(bucket, url, retries=self.retries, backoff=3, label="Alchemy"))
+
+        pending = request("")
+        try:
+            while pending:
+                data = await pending
+                pending = None
+                if not data:
+                    self.truncated = True
+                    return
+                if data.get("pageKey"):
+                    pending = request(data["pageKey"])
+                yield [Asset(f"{self.key}-{nft['tokenId']}", urls) for nft in data.get("nfts", [])
+                       for urls in [alchemy_images(nft)] if urls and nft.get("tokenId")]
+        finally:
+            if pending:
+                pending.cancel()
+
+
+def alchemy_images(nft):
+    """Every usable (non-SVG) image URL Alchemy knows for nft, best first."""
+    urls = []
+    image = nft.get("image", {})
+    if isinstance(image, dict):
+        urls += [image.get(k, "") for k in ("pngUrl", "cachedUrl", "originalUrl", "thumbnailUrl")]
+    urls.append(nft.get("raw", {}).get("metadata", {}).get("image", ""))
+    return [u for u in dict.fromkeys(urls) if u and not u.lower().endswith(".svg")]
+
+
+class UrlTemplate(Source):
+    """Direct image URLs by token ID, e.g. Moonbirds on proof.xyz. No API calls.
+
+    IDs come in random order, so any prefix of the stream is a uniform
+    sample of the whole range.
+    """
+    api = False
+
+    def __init__(self, key, template, first_id=0, last_id=9999, **_):
+        self.key = key
+        self.template = template
+        self.first_id = first_id
+        self.last_id = last_id
+
+    async def pages(self):
+        ids = list(range(self.first_id, self.last_id + 1))
+        random.shuffle(ids)
+        yield [Asset(f"{self.key}-{i}", [self.template.format(i)]) for i in ids]
+
+
+SOURCES = {
+    "helius-collection": HeliusCollection,
+    "helius-creator": HeliusCreator,
+    "alchemy-contract": AlchemyContract,
+    "url-template": UrlTemplate,
+}
+
+
+def make_source(key, spec):
+    """Build the adapter for config entry spec ({"source": ..., adapter kwargs})."""
+    spec = dict(spec)
+    kind = spec.pop("source")
+    if kind not in SOURCES:
+        raise ValueError(f"{key}: unknown source {kind!r} (expected one of {', '.join(SOURCES)})")
+    return SOURCES[kind](key, **spec)
@@ -3,6 +3,9 @@
 import json, os, sys, time, urllib.request, urllib.error
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from poolgen import SupabaseStorage
+
 SUPABASE_URL = os.environ["SUPABASE_URL"]
 SUPABASE_KEY = os.environ["SUPABASE_SERVICE_KEY"]
 BUCKET = "art-pool"
@@ -83,10 +86,5 @@ with open("pool-manifest.json", "w") as f:
     json.dump(new_manifest, f, indent=2)
 
 # Upload
-data = json.dumps(new_manifest).encode()
-url = f"{SUPABASE_URL}/storage/v1/object/art-pool/pool-manifest.json"
-req = urllib.request.Request(url, data=data, method="PUT")
-req.add_header("Authorization", f"Bearer {SUPABASE_KEY}")
-req.add_header("Content-Type", "application/json")
-urllib.request.urlopen(req, timeout=30)
+SupabaseStorage(SUPABASE_URL, SUPABASE_KEY, BUCKET).put_json("pool-manifest.json", new_manifest)
 print("Manifest updated + uploaded ✓")
@@ -5,6 +5,9 @@ Removes all source collection references from filenames, manifest IDs, and metad
 """
 import json, os, sys, time, urllib.request, urllib.error
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from poolgen import SupabaseStorage
+
 SUPABASE_URL = os.environ["SUPABASE_URL"]
 SUPABASE_KEY = os.environ["SUPABASE_SERVICE_KEY"]
 BUCKET = "art-pool"
@@ -111,13 +114,8 @@ def main():
     print(f"Manifest updated: {len(new_pieces)} pieces, all neutral IDs")
 
     # Upload manifest to Supabase
-    data = json.dumps(new_manifest).encode()
-    url = f"{SUPABASE_URL}/storage/v1/object/art-pool/pool-manifest.json"
-    req = urllib.request.Request(url, data=data, method="PUT")
-    req.add_header("Authorization", f"Bearer {SUPABASE_KEY}")
-    req.add_header("Content-Type", "application/json")
     try:
-        urllib.request.urlopen(req, timeout=30)
+        SupabaseStorage(SUPABASE_URL, SUPABASE_KEY, BUCKET).put_json("pool-manifest.json", new_manifest)
         print("Manifest uploaded to Supabase ✓")
     except Exception as e:
         print(f"Manifest upload failed: {e}")